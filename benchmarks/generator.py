@@ -0,0 +1,116 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import random
+from typing import List, Optional, Tuple
+
+from spreadsheet_solver.data_types import ConstraintVariable, DecisionVariable
+
+
+class ModelSpec:
+    """Parameters of a synthetic optimization problem, same seed yields the same problem."""
+
+    def __init__(
+        self,
+        name: str,
+        seed: int,
+        number_variables: int,
+        width: int,
+        number_rows: int,
+        density: float = 1.0,
+        negative_share: float = 0.0,
+        criterion: str = "max",
+    ) -> None:
+        """Construct model spec."""
+        self.name: str = name
+        self.seed: int = seed
+        self.number_variables: int = number_variables
+        # number of integer values per decision variable
+        self.width: int = width
+        self.number_rows: int = number_rows
+        # share of decision variables a constraint row depends on
+        self.density: float = density
+        # share of negative constraint costs
+        self.negative_share: float = negative_share
+        self.criterion: str = criterion
+
+    def to_dict(self) -> dict:
+        """Model spec as json serializable dict."""
+        return dict(vars(self))
+
+
+def generate_model(spec: ModelSpec) -> Tuple[str, dict, Optional[dict]]:
+    """Generate criterion, decision variables and constraint variables of a model spec.
+
+    Every row is satisfied by a random anchor point (with some slack), hence all
+    generated problems have a solution.
+    """
+    rng = random.Random(spec.seed)
+    decision_variables: dict = {}
+    for index in range(spec.number_variables):
+        decision_variable = DecisionVariable(
+            name=f"x{index}", unit_profit=rng.randint(-5, 20)
+        )
+        lower_bound = rng.randint(0, 3)
+        decision_variable.apply_constraint(">=", lower_bound)
+        decision_variable.apply_constraint("<=", lower_bound + spec.width - 1)
+        decision_variables[decision_variable.name] = decision_variable
+    if spec.number_rows <= 0:
+        return spec.criterion, decision_variables, None
+    anchor: List[int] = [
+        rng.randint(decision_variable.lower_bound, decision_variable.upper_bound)
+        for decision_variable in decision_variables.values()
+    ]
+    constraint_variables: dict = {}
+    for row in range(spec.number_rows):
+        columns = [
+            index for index in range(spec.number_variables) if rng.random() < spec.density
+        ]
+        if not columns:
+            columns = [rng.randrange(spec.number_variables)]
+        dependencies = []
+        activity = 0
+        for index in columns:
+            cost = rng.randint(1, 12)
+            if rng.random() < spec.negative_share:
+                cost = -cost
+            dependencies.append((f"x{index}", cost))
+            activity += cost * anchor[index]
+        comparison_operator = rng.choice(ConstraintVariable.allowed_comparison_operators())
+        slack = rng.randint(1, 4 * spec.width)
+        if comparison_operator in ["<=", "<"]:
+            constraint_value = activity + slack
+        else:
+            constraint_value = activity - slack
+        constraint_variables[f"c{row}"] = ConstraintVariable(
+            name=f"c{row}",
+            dependencies=dependencies,
+            comparison_operator=comparison_operator,
+            constraint_value=constraint_value,
+        )
+    return spec.criterion, decision_variables, constraint_variables
+
+
+def default_suite() -> List[ModelSpec]:
+    """Benchmark suite, varies dimension, bound widths, rows, density and cost signs."""
+    return [
+        ModelSpec("unconstrained", seed=1, number_variables=4, width=40, number_rows=0),
+        ModelSpec("knapsack", seed=2, number_variables=4, width=40, number_rows=1),
+        ModelSpec("wide", seed=3, number_variables=2, width=1500, number_rows=2),
+        ModelSpec("deep", seed=4, number_variables=7, width=8, number_rows=2),
+        ModelSpec("dense", seed=5, number_variables=4, width=35, number_rows=5),
+        ModelSpec("sparse", seed=6, number_variables=5, width=18, number_rows=5, density=0.4),
+        ModelSpec(
+            "mixed_signs", seed=7, number_variables=4, width=35, number_rows=3,
+            negative_share=0.4,
+        ),
+        ModelSpec(
+            "minimize", seed=8, number_variables=4, width=35, number_rows=3,
+            negative_share=0.2, criterion="min",
+        ),
+    ]
@@ -0,0 +1,283 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from benchmarks.generator import ModelSpec, default_suite, generate_model
+from spreadsheet_solver.solver import Solver, Timeout, np
+
+# lower limit of --min-seconds, shorter measurements vary by more than the threshold
+NOISE_FLOOR: float = 0.1
+
+
+def available_engines() -> List[str]:
+    """Engines that can run in the current environment (the generated models are integer).
+
+    auto only selects one of the other engines, hence it is not benchmarked itself.
+    """
+    return [
+        engine
+        for engine in Solver.allowed_engines()
+        if engine not in ["lp", "auto"] and (engine != "vectorized" or np is not None)
+    ]
+
+
+def run_case(
+    spec: ModelSpec, engine: str, workers: int, timeout: int, min_seconds: float = 0.0
+) -> dict:
+    """Solve a generated model, executed in a fresh process to isolate its memory.
+
+    Short solves are repeated (with a fresh solver each) until they took min_seconds in
+    total, so that their throughput is not dominated by timer noise.
+    """
+    criterion, decision_variables, constraint_variables = generate_model(spec)
+    runs = 0
+    elapsed = 0.0
+    while True:
+        solver = Solver(
+            timeout=timeout,
+            criterion=criterion,
+            decision_variables=decision_variables,
+            constraint_variables=constraint_variables,
+            engine=engine,
+            workers=workers,
+        )
+        start = time.perf_counter()
+        try:
+            solver.solve()
+        except Timeout:
+            pass
+        elapsed += time.perf_counter() - start
+        runs += 1
+        if elapsed >= min_seconds or not solver.proven:
+            break
+    # peak resident set size in kilobytes, including worker processes of the parallel search
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    points = solver.model.search_space_size()
+    return {
+        "model": spec.name,
+        "engine": engine,
+        "workers": workers,
+        "optimum": solver.optimum,
+        "values": solver.optimal_decision_variable_values,
+        "proven": solver.proven,
+        "points": points,
+        "runs": runs,
+        "seconds": elapsed / runs,
+        "total_seconds": elapsed,
+        "points_per_second": points * runs / elapsed if elapsed > 0 else None,
+        "peak_rss_kb": peak_rss,
+    }
+
+
+def run_suite(
+    suite: List[ModelSpec],
+    engines: List[str],
+    workers: List[int],
+    timeout: int,
+    repeat: int,
+    min_seconds: float = 0.0,
+) -> List[dict]:
+    """Run every model with every engine and worker count, keep the median of repeated runs."""
+    results = []
+    for spec in suite:
+        for engine in engines:
+            for worker_count in workers:
+                runs = []
+                for _ in range(repeat):
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        runs.append(
+                            executor.submit(
+                                run_case, spec, engine, worker_count, timeout, min_seconds
+                            ).result()
+                        )
+                # a single noisy run neither sets nor fails the baseline
+                runs.sort(key=lambda run: run["seconds"])
+                result = runs[(len(runs) - 1) // 2]
+                # relative throughput difference of the slowest and the fastest run
+                result["spread"] = (
+                    1.0 - runs[0]["seconds"] / runs[-1]["seconds"] if runs[-1]["seconds"] else 0.0
+                )
+                print(
+                    f"{spec.name:<14} {engine:<12} workers={worker_count} "
+                    f"optimum={result['optimum']} seconds={result['seconds']:.3f} "
+                    f"runs={result['runs']} "
+                    f"points/s={result['points_per_second'] or 0:.0f} "
+                    f"peak_rss={result['peak_rss_kb']}kB"
+                )
+                results.append(result)
+    return results
+
+
+def check_agreement(results: List[dict]) -> List[str]:
+    """Check that all proven runs of a model report the same optimum and values."""
+    failures = []
+    reference: dict = {}
+    for result in results:
+        if not result["proven"]:
+            failures.append(
+                f"{result['model']}: {result['engine']} (workers={result['workers']}) timed out."
+            )
+            continue
+        solution = (result["optimum"], result["values"])
+        if result["model"] not in reference:
+            reference[result["model"]] = (result, solution)
+            continue
+        first, first_solution = reference[result["model"]]
+        if solution != first_solution:
+            failures.append(
+                f"{result['model']}: {result['engine']} (workers={result['workers']}) found "
+                f"{solution}, but {first['engine']} (workers={first['workers']}) found "
+                f"{first_solution}."
+            )
+    return failures
+
+
+def check_regressions(
+    results: List[dict], baseline: dict, threshold: float, min_seconds: float
+) -> List[str]:
+    """Compare throughput against a baseline, a relative slowdown above threshold fails.
+
+    Measurements that took less than min_seconds (e.g. of baselines recorded before
+    short solves were repeated) are dominated by timer noise, they are reported but not
+    compared. Slowdowns within the spread of the repeated runs (of either measurement)
+    are noise as well, the threshold applies on top of it.
+    """
+    failures = []
+    reference = {
+        (entry["model"], entry["engine"], entry["workers"]): entry
+        for entry in baseline.get("results", [])
+    }
+    for result in results:
+        entry = reference.get((result["model"], result["engine"], result["workers"]))
+        if entry is None or not entry["points_per_second"] or not result["points_per_second"]:
+            continue
+        if min(
+            entry.get("total_seconds", entry["seconds"]),
+            result.get("total_seconds", result["seconds"]),
+        ) < min_seconds:
+            continue
+        ratio = result["points_per_second"] / entry["points_per_second"]
+        noise = max(entry.get("spread", 0.0), result.get("spread", 0.0))
+        if ratio < (1.0 - noise) * (1.0 - threshold):
+            failures.append(
+                f"{result['model']}: {result['engine']} (workers={result['workers']}) "
+                f"throughput dropped to {ratio:.0%} of the baseline."
+            )
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Benchmark entry-point, returns exit code (1 on disagreement or regression)."""
+    parser = argparse.ArgumentParser(description="Spreadsheet solver benchmarks.")
+    parser.add_argument(
+        "--baseline",
+        default="benchmarks/baseline.json",
+        help="Path of the baseline json file.",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Store the results as new baseline instead of comparing against it.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.3,
+        help="Allowed relative throughput drop compared to the baseline.",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.1,
+        help=(
+            "Minimal measured time per case, shorter solves are repeated until they reach "
+            "it (baselines measured for a shorter time are not checked for regressions)."
+        ),
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=available_engines(),
+        help="Engines to benchmark.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2],
+        help="Worker counts to benchmark.",
+    )
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=None,
+        help="Names of the suite models to benchmark (default: all).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of runs per engine and worker count, the median run is recorded.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=120,
+        help="Timeout per run in seconds.",
+    )
+    args = parser.parse_args(argv)
+    if args.min_seconds < NOISE_FLOOR:
+        parser.error(f"--min-seconds needs to be at least {NOISE_FLOOR}, shorter runs are noise.")
+    if args.repeat < 1:
+        parser.error("--repeat needs to be a positive integer.")
+    suite = [
+        spec for spec in default_suite() if args.models is None or spec.name in args.models
+    ]
+    results = run_suite(
+        suite, args.engines, args.workers, args.timeout, args.repeat, args.min_seconds
+    )
+    failures = check_agreement(results)
+    if args.update and failures:
+        print("Baseline has not been stored, the engines disagree.")
+    elif args.update:
+        baseline = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "suite": [spec.to_dict() for spec in suite],
+            "results": results,
+        }
+        with open(args.baseline, mode="w") as file:
+            json.dump(baseline, file, indent=2)
+        print(f"Baseline has been successfully stored in {args.baseline}.")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as file:
+            failures += check_regressions(
+                results, json.load(file), args.threshold, args.min_seconds
+            )
+    else:
+        print(f"No baseline found at {args.baseline}, run with --update to create one.")
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
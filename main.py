@@ -7,36 +7,407 @@ without any warranty. \
 SPDX-License-Identifier: FSFAP
 '''
 import argparse
+import contextlib
+import csv
+import glob
+import io
 import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 
+from spreadsheet_solver.cache import SolutionCache
 from spreadsheet_solver.config import Config, InvalidConfig
+from spreadsheet_solver.presolve import Infeasible, presolve, reduce_columns
+from spreadsheet_solver.results import ResultStore
+from spreadsheet_solver.service import SolveService
 from spreadsheet_solver.solver import Solver, Timeout
+from spreadsheet_solver.stats import SolverStatistics
+from spreadsheet_solver.sweep import rhs_sweep
+
+
+def resolve_config_paths(config: str) -> List[str]:
+    """Resolve config argument (file, directory or glob) to config file paths."""
+    if os.path.isdir(config):
+        return sorted(
+            path
+            for pattern in ["*.yaml", "*.yml", "*.mps", "*.lp"]
+            for path in glob.glob(os.path.join(config, pattern))
+        )
+    if glob.has_magic(config):
+        return sorted(glob.glob(config))
+    return [config]
+
+
+def solve_config(
+    path: str,
+    workers: Optional[int],
+    save_csv: bool,
+    use_cache: bool = True,
+    collect_stats: bool = False,
+    top_k: Optional[int] = None,
+    export_feasible: bool = False,
+    store: Optional[ResultStore] = None,
+) -> List[dict]:
+    """Solve a single config, returns the result rows (one per sweep step).
+
+    Every solve is recorded in the result store (if given), save_csv additionally
+    writes the per-label csv view of the report.
+    """
+    config_file_label:str = os.path.basename(path).split(".")[0] # rm prior path and file extension
+    # phase timings are measured regardless, they are only saved if requested
+    stats = SolverStatistics()
+    solver: Optional[Solver] = None
+    sweep = None
+    start = time.perf_counter()
+    try:
+        with stats.phase("parse"):
+            config = Config(path)
+            timeout = config.get_timeout()
+            criterion = config.get_criterion()
+            decision_variables = config.get_decision_variables(apply_constraints=True)
+            constraint_variables = config.get_constraint_variables()
+            sweep = config.get_sweep()
+        reduction = None
+        start = time.perf_counter()
+        if config.get_presolve() and sweep is None:
+            with stats.phase("presolve"):
+                report = presolve(decision_variables, constraint_variables)
+                reduction = reduce_columns(criterion, decision_variables, constraint_variables)
+            if report is not None and report.size_after < report.size_before:
+                print(report)
+            if reduction is not None:
+                print(reduction)
+        with stats.phase("build"):
+            solver = Solver(
+                timeout=timeout,
+                criterion=criterion,
+                decision_variables=decision_variables
+                if reduction is None
+                else reduction.reduced_decision_variables,
+                constraint_variables=constraint_variables
+                if reduction is None
+                else reduction.reduced_constraint_variables,
+                engine=config.get_engine(),
+                workers=workers if workers is not None else config.get_workers(),
+            )
+        if use_cache:
+            solver.cache = SolutionCache()
+        if collect_stats:
+            solver.stats = stats
+        if sweep is not None:
+            with stats.phase("search"):
+                return solve_sweep(
+                    solver, sweep, config.get_presolve(), config_file_label, save_csv, store
+                )
+        with stats.phase("search"):
+            solver.solve()
+        if reduction is not None:
+            # split the solution of the reduced problem into the original decision variables
+            solver = reduction.postsolve(solver)
+        record = solver.result_record(config_file_label, time.perf_counter() - start)
+        solver.print_solution()
+        if store is not None:
+            store.append(record)
+        if save_csv:
+            ResultStore.write_view(record, "datasets/replication")
+        if top_k is not None:
+            solve_top_k(solver, top_k, config_file_label, save_csv)
+        if export_feasible:
+            export_feasible_points(solver, config_file_label)
+        if solver.optimum is not None:
+            return [solver.result_row(config_file_label)]
+    except InvalidConfig as e:
+        print(e)
+    except Timeout as e:
+        print(e)
+        if store is not None and solver is not None and sweep is None:
+            # timed out without any solution
+            store.append(solver.result_record(config_file_label, time.perf_counter() - start))
+    except Infeasible as e:
+        print(e)
+        if store is not None:
+            store.append(
+                {
+                    "label": config_file_label,
+                    "parameters": {},
+                    "values": {},
+                    "optimum": None,
+                    "engine": "presolve",
+                    "workers": workers if workers is not None else config.get_workers(),
+                    "seconds": time.perf_counter() - start,
+                    "status": "infeasible",
+                }
+            )
+    finally:
+        if collect_stats:
+            stats.save_as_json(f"datasets/replication/{config_file_label}_stats.json")
+    return []
+
+
+def solve_top_k(solver: Solver, k: int, label: str, save_csv: bool) -> None:
+    """Print (and save) the k best feasible points of a solver."""
+    solutions = solver.top_k(k)
+    print(f"Top {k} solutions:")
+    for result, dv_values in solutions:
+        print(f"Objective: {result}, values={list(dv_values)}")
+    if not solver.proven:
+        print(f"Top {k} solutions are not proven: timed out after {solver.timeout} seconds.")
+    if save_csv:
+        solver.save_solutions_as_csv(label, solutions, f"top{k}")
+
+
+def export_feasible_points(solver: Solver, label: str) -> None:
+    """Stream all feasible points of a solver into a csv file, bounded by the timeout."""
+    solver.deadline = time.monotonic() + solver.timeout
+    try:
+        solver.save_solutions_as_csv(label, solver.iter_feasible(), "feasible")
+    except Timeout:
+        print(
+            f"Export of feasible points timed out after {solver.timeout} seconds, "
+            f"the csv file is incomplete."
+        )
+    finally:
+        solver.deadline = None
+
+
+def solve_sweep(
+    solver: Solver,
+    sweep: Tuple[str, List[float]],
+    apply_presolve: bool,
+    label: str,
+    save_csv: bool,
+    store: Optional[ResultStore] = None,
+) -> List[dict]:
+    """Solve right-hand side sweep of a config, one result row per right-hand side.
+
+    Steps without solution (infeasible or timed out) keep their row with empty values,
+    the status column tells them apart.
+    """
+    constraint_variable_name, constraint_values = sweep
+    parameter_key: str = constraint_variable_name.capitalize() + " Bound"
+    results = []
+    start = time.perf_counter()
+    for constraint_value, step in rhs_sweep(
+        solver, constraint_variable_name, constraint_values, apply_presolve
+    ):
+        record = step.result_record(
+            label,
+            time.perf_counter() - start,
+            parameters={constraint_variable_name: constraint_value},
+        )
+        if store is not None:
+            store.append(record)
+        print(f"Sweep: {constraint_variable_name} bound={constraint_value}")
+        step.print_solution()
+        if step.optimum is not None:
+            result = step.result_row(label)
+        else:
+            result = step.solution_row(label, 0.0, [None] * step.number_decision_variables)
+            result["Total Profit"] = None
+        scenario = result.pop("Scenario")
+        results.append(
+            {
+                "Scenario": scenario,
+                parameter_key: constraint_value,
+                **result,
+                "Status": record["status"],
+            }
+        )
+        start = time.perf_counter()
+    if save_csv and results:
+        filename = f"datasets/replication/{label}_sweep.csv"
+        with open(filename, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            for row in results:
+                writer.writerow(row)
+        print(f"Results have been successfully stored in {filename}.")
+    return results
+
+
+def solve_config_captured(
+    path: str,
+    workers: Optional[int],
+    use_cache: bool,
+    collect_stats: bool = False,
+    store_path: Optional[str] = None,
+) -> Tuple[str, List[dict]]:
+    """Solve a single config of a batch, returns captured standard output and result rows.
+
+    Records are appended to the result store by the solving process itself. Unexpected
+    errors of a config are reported, they do not abort the batch.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print(f"Running {os.path.basename(path)}")
+        store = ResultStore(store_path) if store_path is not None else None
+        results: List[dict] = []
+        try:
+            results = solve_config(
+                path,
+                workers,
+                save_csv=False,
+                use_cache=use_cache,
+                collect_stats=collect_stats,
+                store=store,
+            )
+        except Exception as e:
+            print(f"An error occurred while solving {path}: {e!r}")
+        finally:
+            if store is not None:
+                store.flush()
+    return output.getvalue(), results
+
+
+def serve(jobs: int, use_cache: bool, socket_path: Optional[str]) -> None:
+    """Run the solve service on standard input/output or a unix domain socket."""
+    service = SolveService(workers=jobs, use_cache=use_cache)
+    # terminate (e.g. by a process supervisor) shuts down like an interrupt
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        if socket_path is not None:
+            service.serve_socket(socket_path)
+        else:
+
+            def write(text: str) -> None:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+
+            service.serve_stream(sys.stdin, write)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+def save_batch_results(results: List[dict], filename: str) -> None:
+    """Save result rows of a batch as one consolidated csv table."""
+    fieldnames: List[str] = []
+    for result in results:
+        for key in result:
+            if key not in fieldnames and key != "Total Profit":
+                fieldnames.append(key)
+    fieldnames.append("Total Profit")
+    with open(filename, mode="w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+    print(f"Results of {len(results)} configs have been successfully stored in {filename}.")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Spreadsheet solver.")
     parser.add_argument(
         "--config",
         default=os.path.join(os.path.dirname(os.path.abspath(__file__)),"configs/config.yaml"),
-        help="Path to the configuration file.",
+        help="Path to the configuration file, or a directory/glob of configuration files (batch).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes, overrides the solver workers of the config.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Solve from scratch, neither read nor write the solution cache.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Collect solver statistics, stored as json next to the results.",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Additionally report the k best feasible points.",
+    )
+    parser.add_argument(
+        "--export-feasible",
+        action="store_true",
+        help="Additionally stream all feasible points into a csv file.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of configs of a batch solved concurrently.",
+    )
+    parser.add_argument(
+        "--results",
+        default="datasets/replication/results.csv",
+        help="Path of the consolidated results table of a batch.",
+    )
+    parser.add_argument(
+        "--store",
+        default="datasets/results/results.jsonl",
+        help="Path of the result store every solve is appended to.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as solve service: json line requests on stdin (or --socket), --jobs workers.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Path of the unix domain socket of the solve service.",
+    )
+    parser.add_argument(
+        "--export-views",
+        action="store_true",
+        help="Only write the per-label csv views of the latest results of the store.",
     )
     args = parser.parse_args()
-    try:
-        config = Config(args.config)
-        config_file_label:str = os.path.basename(args.config).split(".")[0] # rm prior path and file extension
-        timeout = config.get_timeout()
-        criterion = config.get_criterion()
-        decision_variables = config.get_decision_variables(apply_constraints=True)
-        constraint_variables = config.get_constraint_variables()
-        solver = Solver(
-            timeout=timeout,
-            criterion=criterion,
-            decision_variables=decision_variables,
-            constraint_variables=constraint_variables,
-        )
-        solver.solve()
-        solver.print_solution()
-        solver.save_results_as_csv(config_file_label)
-    except InvalidConfig as e:
-        print(e)
-    except Timeout as e:
-        print(e)
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k needs to be a positive integer.")
+    config_paths = resolve_config_paths(args.config)
+    if args.serve:
+        serve(args.jobs, not args.no_cache, args.socket)
+    elif args.export_views:
+        count = ResultStore(args.store).export_all("datasets/replication")
+        print(f"{count} csv views have been exported from {args.store}.")
+    elif len(config_paths) == 1 and config_paths[0] == args.config:
+        with ResultStore(args.store) as store:
+            solve_config(
+                args.config,
+                args.workers,
+                save_csv=True,
+                use_cache=not args.no_cache,
+                collect_stats=args.stats,
+                top_k=args.top_k,
+                export_feasible=args.export_feasible,
+                store=store,
+            )
+    else:
+        # batch: one process (pool) for all configs, one consolidated results table
+        if args.jobs > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+                outcomes = list(
+                    executor.map(
+                        solve_config_captured,
+                        config_paths,
+                        [args.workers] * len(config_paths),
+                        [not args.no_cache] * len(config_paths),
+                        [args.stats] * len(config_paths),
+                        [args.store] * len(config_paths),
+                    )
+                )
+        else:
+            outcomes = [
+                solve_config_captured(
+                    path, args.workers, not args.no_cache, args.stats, args.store
+                )
+                for path in config_paths
+            ]
+        results = []
+        for output, config_results in outcomes:
+            print(output, end="")
+            results.extend(config_results)
+        save_batch_results(results, args.results)
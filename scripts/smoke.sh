@@ -38,7 +38,7 @@ for app in "${software[@]}"; do
 done
 
 # Packages to be invoked (alt: parse dependencies via requirements.txt; time constraints...)
-packages=("pyyaml")
+packages=("pyyaml" "numpy")
 
 # Invoke Python packages
 for package in "${packages[@]}"; do
@@ -0,0 +1,148 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+from spreadsheet_solver.model import CompiledModel
+
+# bump whenever an engine change may alter stored results, invalidates old entries
+CACHE_VERSION: int = 3
+
+
+class SolutionCache:
+    """On-disk memoization of proven solutions, keyed by a canonical problem hash.
+
+    Entries are json files, least recently used entries are evicted once the cache
+    directory exceeds its size limit. Among tied optima the cached one is returned.
+    """
+
+    def __init__(self, directory: str = "datasets/cache", max_bytes: int = 64 << 20) -> None:
+        """Construct solution cache."""
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+
+    @staticmethod
+    def canonical_form(model: CompiledModel) -> dict:
+        """Problem representation independent of constraint ordering and duplicate bounds.
+
+        The decision variable order is kept, it decides which of tied optima is reported.
+        """
+        decision_variables = [
+            [name, unit_profit, lower_bound, upper_bound, continuous]
+            for name, unit_profit, lower_bound, upper_bound, continuous in zip(
+                model.names,
+                model.unit_profits,
+                model.lower_bounds,
+                model.upper_bounds,
+                model.continuous,
+            )
+        ]
+        constraint_variables = sorted(
+            {
+                json.dumps(
+                    [
+                        [[model.names[column], cost] for column, cost in model.row(row)],
+                        model.comparison_operators[row],
+                        model.constraint_values[row],
+                    ]
+                )
+                for row in range(model.number_rows)
+            }
+        )
+        return {
+            "criterion": model.criterion,
+            "epsilon": model.epsilon,
+            "decision_variables": decision_variables,
+            "constraint_variables": constraint_variables,
+        }
+
+    def key(self, model: CompiledModel) -> str:
+        """Canonical problem hash."""
+        canonical = json.dumps(SolutionCache.canonical_form(model), sort_keys=True)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def path(self, model: CompiledModel) -> str:
+        """Path of the cache entry of a problem."""
+        return os.path.join(self.directory, f"{self.key(model)}.json")
+
+    def get(self, model: CompiledModel) -> Optional[dict]:
+        """Get cache entry of a problem, None on a miss."""
+        path = self.path(model)
+        try:
+            with open(path, "r") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_VERSION:
+            return None
+        # mark entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, model: CompiledModel, optimum: Optional[float], dv_values: list) -> None:
+        """Store proven solution of a problem (optimum None: problem has no solution)."""
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {
+            "version": CACHE_VERSION,
+            "optimum": optimum,
+            "values": dict(zip(model.names, dv_values)) if optimum is not None else {},
+        }
+        # atomic write, concurrent solver processes never read partial entries
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(entry, file)
+        os.replace(temporary_path, self.path(model))
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the size limit is met."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                status = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def lookup(self, solver) -> bool:
+        """Restore the solution of a solver from the cache, returns True on a hit."""
+        entry = self.get(solver.model)
+        if entry is None:
+            return False
+        solver.proven = True
+        solver.optimum = entry["optimum"]
+        if solver.optimum is None:
+            solver.optimal_decision_variable_values = []
+            return True
+        solver.optimal_decision_variable_values = [
+            entry["values"][name] for name in solver.model.names
+        ]
+        return True
+
+    def store(self, solver) -> None:
+        """Store the solution of a solver, only proven solutions are cached."""
+        if solver.proven:
+            self.put(solver.model, solver.optimum, solver.optimal_decision_variable_values)
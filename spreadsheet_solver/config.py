@@ -7,20 +7,57 @@ without any warranty. \
 SPDX-License-Identifier: FSFAP
 """
 
+import os
+
 import yaml
 
 from typing import List, Tuple, Optional
 from spreadsheet_solver import InvalidConfig
 from spreadsheet_solver.data_types import DecisionVariable, ConstraintVariable
+from spreadsheet_solver.readers import read_lp, read_mps
+
+# libyaml based loader is much faster on large configs, pure python fallback otherwise
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# model file readers per file extension, all other files are parsed as yaml config
+MODEL_READERS: dict = {".mps": read_mps, ".lp": read_lp}
 
 
 class Config:
     """Config parser replacing Excel solver spreadsheet and GUI."""
 
     def __init__(self, path: str):
-        """Load yaml file and validate."""
-        with open(path, "r") as file:
-            self.data = yaml.safe_load(file)
+        """Load yaml config (or MPS/LP model file) and validate."""
+        reader = MODEL_READERS.get(os.path.splitext(path)[1].lower())
+        if reader is not None:
+            self.data = reader(path)
+        else:
+            with open(path, "r") as file:
+                try:
+                    self.data = yaml.load(file, Loader=YAML_LOADER)
+                except yaml.YAMLError as e:
+                    raise InvalidConfig(
+                        f"An error occurred while trying to parse the yaml config {path}: {e}"
+                    )
+        self.check_data(path)
+
+    @classmethod
+    def from_data(cls, data, source: str) -> "Config":
+        """Validate already parsed config data, e.g. the json of a service request."""
+        config = cls.__new__(cls)
+        config.data = data
+        config.check_data(source)
+        return config
+
+    def check_data(self, source: str) -> None:
+        """Check that the data is a mapping and validate it."""
+        if not isinstance(self.data, dict):
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to parse the yaml config {source}. "
+                    f"The config needs to be a mapping of keys to values."
+                )
+            )
         try:
             self.validate()
         except InvalidConfig as e:
@@ -74,6 +111,14 @@ class Config:
                 )
             )
 
+        if not isinstance(self.data.get("solver") or {}, dict):
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to parse the yaml config. "
+                    f"The solver options need to be defined as key-value pairs."
+                )
+            )
+
     def get_criterion(self) -> str:
         """Get criterion, i.e., min or max."""
         return self.data["criterion"]
@@ -82,11 +127,65 @@ class Config:
         """get timeout parameter, default: 10s."""
         return self.data["timeout"]
 
+    def get_solver_options(self) -> dict:
+        """Get optional solver options, default: no options."""
+        return self.data.get("solver") or {}
+
+    def get_engine(self) -> str:
+        """Get solver engine, default: auto (selected by model structure)."""
+        return self.get_solver_options().get("engine", "auto")
+
+    def get_workers(self) -> int:
+        """Get number of worker processes, default: 1 (serial search)."""
+        return self.get_solver_options().get("workers", 1)
+
+    def get_presolve(self) -> bool:
+        """Get presolve switch, default: True."""
+        return bool(self.get_solver_options().get("presolve", True))
+
+    def get_sweep(self) -> Optional[Tuple[str, List[float]]]:
+        """Get optional right-hand side sweep, i.e. constraint variable name and values."""
+        sweep = self.data.get("sweep")
+        if sweep is None:
+            return None
+        for key in ["constraint_variable", "start", "stop", "step"]:
+            if not isinstance(sweep, dict) or key not in sweep:
+                raise InvalidConfig(
+                    (
+                        f"An error occurred while trying to parse the sweep. "
+                        f"The user must provide information about {key}."
+                    )
+                )
+        start, stop, step = float(sweep["start"]), float(sweep["stop"]), float(sweep["step"])
+        if step == 0 or (stop - start) * step < 0:
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to parse the sweep. "
+                    f"The step {step} does not lead from {start} to {stop}."
+                )
+            )
+        # stop is inclusive, small tolerance for float steps
+        number_steps = int((stop - start) / step + 1e-7)
+        values = [start + index * step for index in range(number_steps + 1)]
+        return sweep["constraint_variable"], values
+
     def get_decision_variables(self, apply_constraints: bool) -> dict:
         """Get decision variables parsed of config."""
-        # List[Tuple[str, float]] -> dict
+        # List[Tuple[str, float, Optional[str]]] -> dict
         decision_variables: dict = {}
-        for dv_name, dv_unit_profit in self.data["decision_variables"]:
+        for decision_variable in self.data["decision_variables"]:
+            dv_name, dv_unit_profit = decision_variable[0], decision_variable[1]
+            # optional type, default: integer
+            dv_type = decision_variable[2] if len(decision_variable) > 2 else "integer"
+            if dv_type not in DecisionVariable.allowed_types():
+                raise InvalidConfig(
+                    (
+                        f"An error occurred while trying to parse the decision variable "
+                        f'{dv_name}. The type "{dv_type}" is not allowed. '
+                        f"Only the following types are allowed: "
+                        f"{DecisionVariable.allowed_types()}."
+                    )
+                )
             if dv_name in decision_variables:
                 raise InvalidConfig(
                     (
@@ -96,7 +195,7 @@ class Config:
                     )
                 )
             decision_variables[dv_name] = DecisionVariable(
-                name=dv_name, unit_profit=dv_unit_profit
+                name=dv_name, unit_profit=dv_unit_profit, continuous=dv_type == "continuous"
             )
 
         if apply_constraints:
@@ -108,6 +207,14 @@ class Config:
                     comparison_operator,
                     value,
                 ) = decision_variable_constraint
+                if decision_variable_name not in decision_variables:
+                    raise InvalidConfig(
+                        (
+                            f"An error occurred while trying to parse the decision variable "
+                            f"constraints. The decision variable {decision_variable_name} needs "
+                            f"to be created first, before u can constrain it."
+                        )
+                    )
                 decision_variables[decision_variable_name].apply_constraint(
                     comparison_operator, value
                 )
@@ -125,6 +232,10 @@ class Config:
         if self.data["constraint_variables"] is None:
             return None
         constraint_variables: dict = {}
+        # names of all decision variables, collected once for the membership checks
+        dv_names = set(
+            decision_variable[0] for decision_variable in self.data["decision_variables"]
+        )
         for cv_name, dv_list, comp_op, bound_val in self.data["constraint_variables"]:
             # check if constraint variable is unique
             if cv_name in constraint_variables:
@@ -137,7 +248,7 @@ class Config:
                 )
             # check if decision variables exist
             for dv_name, dv_cost in dv_list:
-                if dv_name not in self.get_decision_variables(apply_constraints=False):
+                if dv_name not in dv_names:
                     raise InvalidConfig(
                         (
                             f"An error occurred while trying to parse the constraint variable "
@@ -10,13 +10,15 @@ from typing import List, Tuple, Optional
 
 from spreadsheet_solver import InvalidConfig
 
+# epsilon for float comparison, see Solver.epsilon_comp_val()
+EPSILON: float = 1e-7
+
 
 class DecisionVariable:
     """Define decision variables and apply constraints."""
 
-    value: int = None
-    lower_bound: Optional[int] = None
-    upper_bound: Optional[int] = None
+    # compact instances, batch processes hold many of them
+    __slots__ = ("name", "unit_profit", "continuous", "value", "lower_bound", "upper_bound")
 
     # call DecisionVariable.allowed_comparison_operators()
     @staticmethod
@@ -24,10 +26,21 @@ class DecisionVariable:
         """Get allowed comparison operators."""
         return ["<", "<=", ">", ">="]
 
-    def __init__(self, name: str, unit_profit: float) -> None:
+    # call DecisionVariable.allowed_types()
+    @staticmethod
+    def allowed_types() -> List[str]:
+        """Get allowed types of decision variables."""
+        return ["integer", "continuous"]
+
+    def __init__(self, name: str, unit_profit: float, continuous: bool = False) -> None:
         """Construct decision variable."""
         self.name: str = name
         self.unit_profit: float = float(unit_profit)
+        # continuous decision variables take any real value within their bounds
+        self.continuous: bool = continuous
+        self.value: Optional[int] = None
+        self.lower_bound: Optional[int] = None
+        self.upper_bound: Optional[int] = None
 
     def __str__(self) -> str:
         """String representation of decision variable."""
@@ -50,19 +63,24 @@ class DecisionVariable:
                     f"upper bound: {DecisionVariable.allowed_comparison_operators()}."
                 )
             )
+        # strict bounds of continuous decision variables keep an epsilon margin
+        if self.continuous:
+            step = EPSILON
+        else:
+            step = 1
         # check if new constraint is more strict than current lower and upper bound
         if comparison_operator == "<=":
             if self.upper_bound is None or value < self.upper_bound:
                 self.upper_bound = value
         if comparison_operator == "<":
-            if self.upper_bound is None or value - 1 < self.upper_bound:
-                self.upper_bound = value - 1
+            if self.upper_bound is None or value - step < self.upper_bound:
+                self.upper_bound = value - step
         if comparison_operator == ">=":
             if self.lower_bound is None or value > self.lower_bound:
                 self.lower_bound = value
         if comparison_operator == ">":
-            if self.lower_bound is None or value + 1 > self.lower_bound:
-                self.lower_bound = value + 1
+            if self.lower_bound is None or value + step > self.lower_bound:
+                self.lower_bound = value + step
 
         # check if lower_bound is still <= upper bound
         # requires lower and upper bound to be initialized :: both values not None
@@ -80,6 +98,8 @@ class DecisionVariable:
 class ConstraintVariable:
     """Constraints based on one or multiple decision variables."""
 
+    __slots__ = ("name", "dependencies", "comparison_operator", "constraint_value")
+
     @staticmethod
     def allowed_comparison_operators() -> List[str]:
         """Get allowed comparison operators of constraint variable."""
@@ -0,0 +1,170 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from spreadsheet_solver.model import CompiledModel
+from spreadsheet_solver.parallel import search_shard
+from spreadsheet_solver.solver import Solver, Timeout
+
+# integer objectives below this magnitude are exact as float
+MAX_EXACT: int = 1 << 53
+
+
+def connected_components(model: CompiledModel) -> List[List[int]]:
+    """Columns of the connected components of the column-row incidence graph."""
+    parents = list(range(model.number_variables))
+
+    def find(column: int) -> int:
+        while parents[column] != column:
+            parents[column] = parents[parents[column]]
+            column = parents[column]
+        return column
+
+    for row in range(model.number_rows):
+        columns = [column for column, _ in model.row(row)]
+        for column in columns[1:]:
+            first, other = find(columns[0]), find(column)
+            if first != other:
+                parents[max(first, other)] = min(first, other)
+    components: dict = {}
+    for column in range(model.number_variables):
+        components.setdefault(find(column), []).append(column)
+    return list(components.values())
+
+
+def independent_blocks(model: CompiledModel) -> Optional[List[CompiledModel]]:
+    """Sub-models of the connected components by search space size, None unless there are
+    at least two.
+
+    Among tied optima the sum of the blocks is the point brute-force would have found
+    first (blocks are independent), this requires exact objectives, i.e. integer profits
+    of an integer model.
+    """
+    if model.number_variables < 2 or any(model.continuous):
+        return None
+    magnitude = sum(
+        abs(model.unit_profits[column])
+        * max(abs(model.lower_bounds[column]), abs(model.upper_bounds[column]))
+        for column in range(model.number_variables)
+    )
+    if magnitude >= MAX_EXACT or not all(
+        float(unit_profit).is_integer() for unit_profit in model.unit_profits
+    ):
+        return None
+    components = connected_components(model)
+    if len(components) < 2:
+        return None
+    component_of = {}
+    for index, columns in enumerate(components):
+        for column in columns:
+            component_of[column] = index
+    rows: List[List[int]] = [[] for _ in components]
+    for row in range(model.number_rows):
+        if model.row_starts[row] < model.row_starts[row + 1]:
+            rows[component_of[model.row_columns[model.row_starts[row]]]].append(row)
+    blocks = [
+        block_model(model, columns, block_rows)
+        for columns, block_rows in zip(components, rows)
+    ]
+    # small blocks first, a hard block does not use up the time of the others
+    return sorted(blocks, key=lambda block: block.search_space_size())
+
+
+def block_model(model: CompiledModel, columns: List[int], rows: List[int]) -> CompiledModel:
+    """Sub-model of some columns and the rows that only depend on them."""
+    position = {column: index for index, column in enumerate(columns)}
+    row_starts = [0]
+    row_columns = []
+    row_costs = []
+    for row in rows:
+        for column, cost in model.row(row):
+            row_columns.append(position[column])
+            row_costs.append(cost)
+        row_starts.append(len(row_columns))
+    return CompiledModel(
+        criterion=model.criterion,
+        names=[model.names[column] for column in columns],
+        unit_profits=[model.unit_profits[column] for column in columns],
+        lower_bounds=[model.lower_bounds[column] for column in columns],
+        upper_bounds=[model.upper_bounds[column] for column in columns],
+        row_names=[model.row_names[row] for row in rows],
+        row_starts=row_starts,
+        row_columns=row_columns,
+        row_costs=row_costs,
+        comparison_operators=[model.comparison_operators[row] for row in rows],
+        constraint_values=[model.constraint_values[row] for row in rows],
+        epsilon=model.epsilon,
+        continuous=[model.continuous[column] for column in columns],
+    )
+
+
+def decomposed_search(solver: Solver, blocks: List[CompiledModel]) -> None:
+    """Solve independent blocks (in worker processes if workers > 1), combine their optima."""
+    model = solver.model
+    # rows without decision variables do not belong to any block
+    for row in range(model.number_rows):
+        if model.row_starts[row] == model.row_starts[row + 1] and model.is_violated(row, 0.0):
+            return
+    # wall clock deadline, monotonic clocks are not comparable between processes
+    deadline = time.time() + (solver.deadline - time.monotonic())
+    collect_stats = solver.stats is not None
+    if solver.workers > 1:
+        with ProcessPoolExecutor(max_workers=min(solver.workers, len(blocks))) as executor:
+            futures = [
+                executor.submit(search_shard, block, solver.engine, deadline, collect_stats)
+                for block in blocks
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = []
+        for block in blocks:
+            block_solver = Solver.from_model(
+                block, timeout=max(solver.deadline - time.monotonic(), 0.0), engine=solver.engine
+            )
+            block_solver.cancelled = solver.cancelled
+            block_solver.stats = solver.stats
+            try:
+                block_solver.solve()
+            except Timeout:
+                pass
+            results.append(
+                (
+                    block_solver.optimum,
+                    block_solver.optimal_decision_variable_values,
+                    block_solver.proven,
+                    block_solver.explored,
+                    None,
+                )
+            )
+            # an infeasible block makes the whole problem infeasible
+            if block_solver.optimum is None:
+                break
+
+    dv_values: dict = {}
+    proven = True
+    for block, (optimum, values, block_proven, explored, stats) in zip(blocks, results):
+        proven = proven and block_proven
+        solver.explored += explored
+        if stats is not None:
+            solver.stats.merge(stats)
+        if optimum is None:
+            if block_proven:
+                return
+            raise Timeout(f"Solver function timed out after {solver.timeout} seconds.")
+        dv_values.update(zip(block.names, values))
+    optimal_decision_variable_values = [dv_values[name] for name in model.names]
+    solver.store_optimum(
+        model.objective_value(optimal_decision_variable_values),
+        optimal_decision_variable_values,
+    )
+    if not proven:
+        raise Timeout(f"Solver function timed out after {solver.timeout} seconds.")
+    solver.explored = model.search_space_size()
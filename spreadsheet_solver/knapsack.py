@@ -0,0 +1,160 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import math
+from array import array
+from collections import deque
+from functools import reduce
+from typing import List, Optional
+
+from spreadsheet_solver.model import CompiledModel
+
+# upper bound for dynamic programming table cells (8 bytes each)
+MAX_CELLS: int = 1 << 23
+
+# integer objectives below this magnitude are exact as float
+MAX_EXACT: int = 1 << 53
+
+
+class KnapsackForm:
+    """Single row integer model as bounded knapsack.
+
+    maximize sum(profit * y) s.t. sum(weight * y) <= capacity, 0 <= y <= count, with
+    dv_value = lower + y for non-negative row costs and dv_value = upper - y otherwise.
+    Weights are divided by their greatest common divisor.
+    """
+
+    def __init__(
+        self,
+        profits: List[int],
+        weights: List[int],
+        counts: List[int],
+        capacity: int,
+        flipped: List[bool],
+    ) -> None:
+        """Construct knapsack form."""
+        self.profits: List[int] = profits
+        self.weights: List[int] = weights
+        self.counts: List[int] = counts
+        self.capacity: int = capacity
+        self.flipped: List[bool] = flipped
+
+    def cells(self) -> int:
+        """Number of dynamic programming table cells."""
+        return (len(self.weights) + 1) * (max(self.capacity, 0) + 1)
+
+
+def knapsack_form(model: CompiledModel) -> Optional[KnapsackForm]:
+    """Knapsack form of a model, None unless it has one row and integer costs/profits only."""
+    if model.number_rows != 1 or any(model.continuous):
+        return None
+    coefficients = [0.0] * model.number_variables
+    for column, cost in model.row(0):
+        coefficients[column] += model.signs[0] * cost
+    if not all(float(value).is_integer() for value in coefficients + list(model.unit_profits)):
+        return None
+    limit = model.limits[0]
+    # largest integer activity satisfying the row
+    capacity = math.ceil(limit) - 1 if model.strict[0] else math.floor(limit)
+    sense = 1 if model.criterion == "max" else -1
+    profits, weights, counts, flipped = [], [], [], []
+    magnitude = 0
+    for column in range(model.number_variables):
+        cost = int(coefficients[column])
+        profit = sense * int(model.unit_profits[column])
+        lower, upper = model.lower_bounds[column], model.upper_bounds[column]
+        magnitude += abs(profit) * max(abs(lower), abs(upper))
+        if cost >= 0:
+            capacity -= cost * lower
+            profits.append(profit)
+        else:
+            capacity -= cost * upper
+            profits.append(-profit)
+        weights.append(abs(cost))
+        counts.append(upper - lower)
+        flipped.append(cost < 0)
+    if magnitude >= MAX_EXACT:
+        return None
+    # integer activities are multiples of the greatest common divisor
+    divisor = reduce(math.gcd, weights, 0)
+    if divisor > 1:
+        weights = [weight // divisor for weight in weights]
+        capacity = capacity // divisor
+    # a capacity above the maximal activity never binds
+    capacity = min(capacity, sum(weight * count for weight, count in zip(weights, counts)))
+    return KnapsackForm(profits, weights, counts, capacity, flipped)
+
+
+def bounded_max(previous: array, profit: int, weight: int, count: int, capacity: int) -> array:
+    """Table of an additional item: max of profit * y + previous[c - weight * y], y <= count."""
+    if weight == 0:
+        gain = max(0, profit * count)
+        return array("q", (value + gain for value in previous))
+    table = array("q", previous)
+    if count >= capacity // weight:
+        # unbounded item, every count fitting into the capacity is allowed
+        for c in range(weight, capacity + 1):
+            candidate = table[c - weight] + profit
+            if candidate > table[c]:
+                table[c] = candidate
+        return table
+    # sliding window maximum over the last count + 1 entries per residue class
+    for residue in range(min(weight, capacity + 1)):
+        window: deque = deque()
+        for k, c in enumerate(range(residue, capacity + 1, weight)):
+            value = previous[c] - profit * k
+            while window and window[-1][1] <= value:
+                window.pop()
+            window.append((k, value))
+            if window[0][0] < k - count:
+                window.popleft()
+            table[c] = window[0][1] + profit * k
+    return table
+
+
+def knapsack_search(solver, form: KnapsackForm) -> None:
+    """Solve knapsack form by dynamic programming, keeps the tie rule of brute-force.
+
+    Tables hold the best profit of the trailing items per capacity, the point is
+    reconstructed front to back with the smallest optimal value per decision variable.
+    """
+    model = solver.model
+    if form.capacity < 0:
+        # not even the best case of every decision variable satisfies the row
+        return
+    number_variables = model.number_variables
+    tables: List[array] = [array("q")] * (number_variables + 1)
+    tables[number_variables] = array("q", bytes(8 * (form.capacity + 1)))
+    for column in reversed(range(number_variables)):
+        solver.check_deadline()
+        tables[column] = bounded_max(
+            tables[column + 1],
+            form.profits[column],
+            form.weights[column],
+            form.counts[column],
+            form.capacity,
+        )
+    if solver.stats is not None:
+        solver.stats.add(nodes=form.cells())
+
+    dv_values = []
+    remaining = form.capacity
+    for column in range(number_variables):
+        target = tables[column][remaining]
+        following = tables[column + 1]
+        lower, upper = model.lower_bounds[column], model.upper_bounds[column]
+        weight, profit = form.weights[column], form.profits[column]
+        for dv_value in range(lower, upper + 1):
+            count = upper - dv_value if form.flipped[column] else dv_value - lower
+            used = weight * count
+            if used <= remaining and profit * count + following[remaining - used] == target:
+                break
+        dv_values.append(dv_value)
+        remaining -= used
+    solver.explored = model.search_space_size()
+    solver.store_optimum(model.objective_value(dv_values), dv_values)
@@ -0,0 +1,191 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+from typing import List, Optional, Tuple
+
+# tolerance for pivoting and optimality checks
+TOLERANCE: float = 1e-9
+# safety net, bland's rule already guarantees termination
+MAX_ITERATIONS: int = 100000
+
+
+class NotConverged(Exception):
+    """Exception raised if the simplex method exceeds MAX_ITERATIONS (e.g. numerical cycling)."""
+
+    def __init__(self, message="Simplex method did not converge."):
+        self.message = message
+        super().__init__(self.message)
+
+
+def maximize(
+    objective: List[float],
+    rows: List[Tuple[List[float], float]],
+    lower: List[float],
+    upper: List[float],
+) -> Optional[Tuple[float, List[float]]]:
+    """Maximize objective*x s.t. row*x <= rhs for every row and lower <= x <= upper.
+
+    Bounded-variable two-phase simplex (dense tableau, Bland's rule). Returns None if the
+    linear program is infeasible, else the optimal value and one optimal point. Raises
+    NotConverged if no optimal tableau is reached within MAX_ITERATIONS.
+    """
+    number_variables = len(objective)
+    number_rows = len(rows)
+    # shift variables to y = x - lower, i.e. 0 <= y <= upper - lower
+    width = [upper[j] - lower[j] for j in range(number_variables)]
+    if any(w < -TOLERANCE for w in width):
+        return None
+    # columns: y (number_variables), slack (number_rows), artificial (number_rows)
+    number_columns = number_variables + 2 * number_rows
+    column_upper: List[float] = (
+        [max(w, 0.0) for w in width]
+        + [float("inf")] * number_rows
+        + [float("inf")] * number_rows
+    )
+    tableau: List[List[float]] = []
+    beta: List[float] = []
+    basis: List[int] = []
+    for i, (coefficients, rhs) in enumerate(rows):
+        rhs -= sum(c * lower[j] for j, c in enumerate(coefficients))
+        row = [0.0] * number_columns
+        for j, c in enumerate(coefficients):
+            row[j] = c
+        row[number_variables + i] = 1.0
+        if rhs >= 0:
+            # slack is a feasible starting basic variable, artificial is never needed
+            column_upper[number_variables + number_rows + i] = 0.0
+            basis.append(number_variables + i)
+        else:
+            # negate row, artificial variable starts in the basis
+            row = [-c for c in row]
+            rhs = -rhs
+            row[number_variables + number_rows + i] = 1.0
+            basis.append(number_variables + number_rows + i)
+        tableau.append(row)
+        beta.append(rhs)
+    at_upper = [False] * number_columns
+
+    # phase 1: drive artificial variables to zero
+    phase_one = [0.0] * number_columns
+    for i in range(number_rows):
+        phase_one[number_variables + number_rows + i] = -1.0
+    if any(basis[i] >= number_variables + number_rows for i in range(number_rows)):
+        _simplex(phase_one, tableau, beta, basis, at_upper, column_upper)
+        infeasibility = sum(
+            beta[i]
+            for i in range(number_rows)
+            if basis[i] >= number_variables + number_rows
+        )
+        if infeasibility > TOLERANCE * max(1.0, number_rows):
+            return None
+        # artificial variables are fixed at zero from now on
+        for i in range(number_rows):
+            column_upper[number_variables + number_rows + i] = 0.0
+
+    # phase 2: optimize the actual objective
+    phase_two = list(objective) + [0.0] * (2 * number_rows)
+    if not _simplex(phase_two, tableau, beta, basis, at_upper, column_upper):
+        return None
+
+    y = [column_upper[j] if at_upper[j] else 0.0 for j in range(number_columns)]
+    for i, column in enumerate(basis):
+        y[column] = beta[i]
+    x = [lower[j] + y[j] for j in range(number_variables)]
+    value = sum(objective[j] * x[j] for j in range(number_variables))
+    return value, x
+
+
+def _simplex(
+    cost: List[float],
+    tableau: List[List[float]],
+    beta: List[float],
+    basis: List[int],
+    at_upper: List[bool],
+    column_upper: List[float],
+) -> bool:
+    """Run primal simplex iterations inplace, returns False if the problem is unbounded.
+
+    Raises NotConverged if the iterations run out before an optimal tableau is reached.
+    """
+    number_rows = len(tableau)
+    number_columns = len(cost)
+    basic = set(basis)
+    for _ in range(MAX_ITERATIONS):
+        # reduced costs of nonbasic columns
+        entering = -1
+        direction = 0
+        for j in range(number_columns):
+            if j in basic or column_upper[j] <= TOLERANCE:
+                continue
+            reduced_cost = cost[j] - sum(
+                cost[basis[i]] * tableau[i][j] for i in range(number_rows)
+            )
+            if not at_upper[j] and reduced_cost > TOLERANCE:
+                entering, direction = j, 1
+                break
+            if at_upper[j] and reduced_cost < -TOLERANCE:
+                entering, direction = j, -1
+                break
+        if entering < 0:
+            return True
+
+        # ratio test, entering column changes by direction * step
+        step = column_upper[entering]
+        leaving_row = -1
+        leaving_to_upper = False
+        for i in range(number_rows):
+            rate = -tableau[i][entering] * direction
+            if rate < -TOLERANCE:
+                limit = beta[i] / -rate
+                to_upper = False
+            elif rate > TOLERANCE and column_upper[basis[i]] != float("inf"):
+                limit = (column_upper[basis[i]] - beta[i]) / rate
+                to_upper = True
+            else:
+                continue
+            limit = max(limit, 0.0)
+            if limit < step - TOLERANCE or (
+                limit <= step + TOLERANCE
+                and leaving_row >= 0
+                and basis[i] < basis[leaving_row]
+            ):
+                step, leaving_row, leaving_to_upper = limit, i, to_upper
+        if step == float("inf"):
+            return False
+
+        for i in range(number_rows):
+            beta[i] -= tableau[i][entering] * direction * step
+        if leaving_row < 0:
+            # bound flip, entering column stays nonbasic
+            at_upper[entering] = not at_upper[entering]
+            continue
+
+        # pivot entering column into the basis
+        entering_value = (column_upper[entering] if at_upper[entering] else 0.0) + (
+            direction * step
+        )
+        leaving = basis[leaving_row]
+        pivot_row = tableau[leaving_row]
+        pivot = pivot_row[entering]
+        for j in range(number_columns):
+            pivot_row[j] /= pivot
+        for i in range(number_rows):
+            if i == leaving_row:
+                continue
+            factor = tableau[i][entering]
+            if factor != 0.0:
+                row = tableau[i]
+                for j in range(number_columns):
+                    row[j] -= factor * pivot_row[j]
+        beta[leaving_row] = entering_value
+        basic.discard(leaving)
+        basic.add(entering)
+        basis[leaving_row] = entering
+        at_upper[entering] = False
+        at_upper[leaving] = leaving_to_upper
+    raise NotConverged(f"Simplex method did not converge within {MAX_ITERATIONS} iterations.")
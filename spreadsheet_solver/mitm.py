@@ -0,0 +1,255 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import bisect
+import math
+from typing import List, Optional, Tuple
+
+from spreadsheet_solver.model import CompiledModel
+
+# upper bound for enumerated points per half
+MAX_HALF: int = 1 << 20
+
+# integer objectives and row activities below this magnitude are exact as float
+MAX_EXACT: int = 1 << 53
+
+# points enumerated in between deadline checks
+BLOCK_SIZE: int = 1 << 14
+
+
+class MeetInTheMiddle:
+    """Integer model with one or two rows, split into a first and a second half of columns.
+
+    Every half is enumerated on its own as (profit, row usages) per point, points are
+    identified by their rank in counting order. Profits are sense * unit profit, usages
+    are the normalized row activities, i.e. a point is feasible iff usage <= capacity.
+    """
+
+    def __init__(
+        self,
+        profits: List[int],
+        costs: List[List[int]],
+        capacities: List[int],
+        split: int,
+    ) -> None:
+        """Construct split model, costs per row and column."""
+        self.profits: List[int] = profits
+        self.costs: List[List[int]] = costs
+        self.capacities: List[int] = capacities
+        self.split: int = split
+
+
+def half_sizes(model: CompiledModel, split: int) -> Tuple[int, int]:
+    """Number of points of the first and the second half."""
+    widths = [
+        model.upper_bounds[column] - model.lower_bounds[column] + 1
+        for column in range(model.number_variables)
+    ]
+    return math.prod(widths[:split]), math.prod(widths[split:])
+
+
+def mitm_form(model: CompiledModel) -> Optional[MeetInTheMiddle]:
+    """Split form of a model, None unless it has one or two rows and integer costs/profits."""
+    if model.number_rows not in [1, 2] or model.number_variables < 2 or any(model.continuous):
+        return None
+    sense = 1 if model.criterion == "max" else -1
+    if not all(float(unit_profit).is_integer() for unit_profit in model.unit_profits):
+        return None
+    costs = [[0] * model.number_variables for _ in range(model.number_rows)]
+    for row in range(model.number_rows):
+        for column, cost in model.row(row):
+            if not float(cost).is_integer():
+                return None
+            costs[row][column] += int(model.signs[row]) * int(cost)
+    magnitude = max(
+        sum(
+            abs(values[column])
+            * max(abs(model.lower_bounds[column]), abs(model.upper_bounds[column]))
+            for column in range(model.number_variables)
+        )
+        for values in costs + [list(model.unit_profits)]
+    )
+    if magnitude >= MAX_EXACT:
+        return None
+    # largest integer activity satisfying the row
+    capacities = [
+        math.ceil(model.limits[row]) - 1 if model.strict[row] else math.floor(model.limits[row])
+        for row in range(model.number_rows)
+    ]
+    # balance the halves, i.e. minimize the larger one
+    split = min(
+        range(1, model.number_variables), key=lambda split: max(half_sizes(model, split))
+    )
+    return MeetInTheMiddle(
+        [sense * int(unit_profit) for unit_profit in model.unit_profits],
+        costs,
+        capacities,
+        split,
+    )
+
+
+def enumerate_half(
+    solver, form: MeetInTheMiddle, columns: range
+) -> Tuple[List[int], List[List[int]]]:
+    """Profits and row usages of all points of a half, in counting order."""
+    model = solver.model
+    profits = [0]
+    usages = [[0] for _ in form.capacities]
+    for column in columns:
+        solver.check_deadline()
+        values = range(model.lower_bounds[column], model.upper_bounds[column] + 1)
+        profit = form.profits[column]
+        profits = [total + profit * value for total in profits for value in values]
+        for row, usage in enumerate(usages):
+            cost = form.costs[row][column]
+            usages[row] = [total + cost * value for total in usage for value in values]
+    return profits, usages
+
+
+def pareto_front(profits: List[int], usages: List[List[int]]) -> List[int]:
+    """Ranks of points not dominated by a point with lower usages and better key.
+
+    The key of a point is (profit, -rank): among equal profits smaller ranks win, which
+    keeps the tie rule of brute-force. Single row halves are reduced to a staircase of
+    increasing usage and key, two row halves to the best point per usage pair, swept in
+    order of their first row usage with a prefix maximum tree of the keys over the second
+    row usage.
+    """
+    if len(usages) == 1:
+        usage = usages[0]
+        front = []
+        best = None
+        order = sorted(
+            range(len(profits)), key=lambda rank: (usage[rank], -profits[rank], rank)
+        )
+        for rank in order:
+            key = (profits[rank], -rank)
+            if best is None or key > best:
+                best = key
+                front.append(rank)
+        return front
+    # best point per usage pair
+    best_per_usage: dict = {}
+    for rank, usage in enumerate(zip(usages[0], usages[1])):
+        other = best_per_usage.get(usage)
+        if other is None or profits[rank] > profits[other]:
+            best_per_usage[usage] = rank
+    levels = sorted({second_usage for _, second_usage in best_per_usage})
+    level_positions = {level: position + 1 for position, level in enumerate(levels)}
+    tree: List[Optional[Tuple[int, int]]] = [None] * (len(levels) + 1)
+    front = []
+    # usage pairs are unique, points swept so far have a lower (or equal) first row usage
+    for usage in sorted(best_per_usage):
+        rank = best_per_usage[usage]
+        key = (profits[rank], -rank)
+        if not is_dominated(tree, level_positions[usage[1]], key):
+            tree_update(tree, level_positions[usage[1]], key)
+            front.append(rank)
+    return sorted(front)
+
+
+def is_dominated(
+    tree: List[Optional[Tuple[int, int]]], position: int, key: Tuple[int, int]
+) -> bool:
+    """Whether a key at positions 1..position of a prefix maximum tree beats the given key."""
+    while position > 0:
+        if tree[position] is not None and tree[position] > key:
+            return True
+        position -= position & -position
+    return False
+
+
+def tree_update(
+    tree: List[Optional[Tuple[int, int]]], position: int, key: Tuple[int, int]
+) -> None:
+    """Insert key at a (1-based) position of a prefix maximum (fenwick) tree."""
+    while position < len(tree):
+        if tree[position] is None or key > tree[position]:
+            tree[position] = key
+        position += position & -position
+
+
+def tree_query(
+    tree: List[Optional[Tuple[int, int]]], position: int
+) -> Optional[Tuple[int, int]]:
+    """Maximum key at the positions 1..position of a prefix maximum tree, None if empty."""
+    found = None
+    while position > 0:
+        if tree[position] is not None and (found is None or tree[position] > found):
+            found = tree[position]
+        position -= position & -position
+    return found
+
+
+def decode(model: CompiledModel, columns: range, rank: int) -> List[int]:
+    """Decision variable values of a point of a half by its rank in counting order."""
+    dv_values = []
+    for column in reversed(columns):
+        width = model.upper_bounds[column] - model.lower_bounds[column] + 1
+        rank, offset = divmod(rank, width)
+        dv_values.append(model.lower_bounds[column] + offset)
+    return dv_values[::-1]
+
+
+def mitm_search(solver, form: MeetInTheMiddle) -> None:
+    """Combine the Pareto fronts of both halves by a sweep over the first row usage.
+
+    Second half points are inserted in order of their first row usage into a prefix
+    maximum tree over their second row usage, first half points query it in order of
+    their remaining first row capacity. The best total with the smallest ranks (first
+    half before second half) is the point brute-force would have found first.
+    """
+    model = solver.model
+    first = range(0, form.split)
+    second = range(form.split, model.number_variables)
+    first_profits, first_usages = enumerate_half(solver, form, first)
+    second_profits, second_usages = enumerate_half(solver, form, second)
+    if solver.stats is not None:
+        solver.stats.add(leaves_visited=len(first_profits) + len(second_profits))
+    first_front = pareto_front(first_profits, first_usages)
+    second_front = pareto_front(second_profits, second_usages)
+    two_rows = len(form.capacities) == 2
+
+    # prefix maximum (fenwick) tree over the second row usage of second half points
+    levels = sorted({second_usages[1][rank] for rank in second_front}) if two_rows else [0]
+    tree: List[Optional[Tuple[int, int]]] = [None] * (len(levels) + 1)
+    second_front.sort(key=lambda rank: second_usages[0][rank])
+    queries = sorted(
+        first_front, key=lambda rank: form.capacities[0] - first_usages[0][rank]
+    )
+    best = None
+    inserted = 0
+    for count, rank in enumerate(queries):
+        if count % BLOCK_SIZE == 0:
+            solver.check_deadline()
+        threshold = form.capacities[0] - first_usages[0][rank]
+        while (
+            inserted < len(second_front)
+            and second_usages[0][second_front[inserted]] <= threshold
+        ):
+            other = second_front[inserted]
+            key = (second_profits[other], -other)
+            position = bisect.bisect_left(levels, second_usages[1][other]) + 1 if two_rows else 1
+            tree_update(tree, position, key)
+            inserted += 1
+        position = (
+            bisect.bisect_right(levels, form.capacities[1] - first_usages[1][rank])
+            if two_rows
+            else 1
+        )
+        found = tree_query(tree, position)
+        if found is None:
+            continue
+        candidate = (first_profits[rank] + found[0], -rank, found[1])
+        if best is None or candidate > best:
+            best = candidate
+    solver.explored = model.search_space_size()
+    if best is None:
+        return
+    dv_values = decode(model, first, -best[1]) + decode(model, second, -best[2])
+    solver.store_optimum(model.objective_value(dv_values), dv_values)
@@ -0,0 +1,269 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from spreadsheet_solver.data_types import DecisionVariable, ConstraintVariable
+
+
+class CompiledModel:
+    """Index-based form of an optimization problem, compiled once per solve.
+
+    Decision variables are referenced by their position, constraint variables are stored
+    row-wise in compressed sparse form (dependency order is kept, such that sums are
+    accumulated in the same order as the name-based evaluation). Comparison operators
+    are normalized to: violated iff sign * sum > limit (sign * sum >= limit if strict).
+    Continuous decision variables are not enumerated, they are left to linear programs.
+    Numeric row data and profits are stored in typed arrays (8 bytes per entry instead of
+    a pointer to a boxed number), bounds stay lists since presolve and shards replace them.
+    """
+
+    def __init__(
+        self,
+        criterion: str,
+        names: List[str],
+        unit_profits: Sequence[float],
+        lower_bounds: List[int],
+        upper_bounds: List[int],
+        row_names: List[str],
+        row_starts: Sequence[int],
+        row_columns: Sequence[int],
+        row_costs: Sequence[float],
+        comparison_operators: List[str],
+        constraint_values: Sequence[float],
+        epsilon: float,
+        continuous: Optional[List[bool]] = None,
+    ) -> None:
+        """Construct compiled model, see CompiledModel.compile()."""
+        self.criterion: str = criterion
+        self.names: List[str] = names
+        self.unit_profits: array = array("d", unit_profits)
+        self.lower_bounds: List[int] = lower_bounds
+        self.upper_bounds: List[int] = upper_bounds
+        self.row_names: List[str] = row_names
+        self.row_starts: array = array("q", row_starts)
+        self.row_columns: array = array("q", row_columns)
+        self.row_costs: array = array("d", row_costs)
+        self.comparison_operators: List[str] = comparison_operators
+        self.constraint_values: array = array("d", constraint_values)
+        self.epsilon: float = epsilon
+        self.continuous: List[bool] = continuous or [False] * len(names)
+        # columns enumerated by the search engines, in model order
+        self.integer_columns: List[int] = [
+            column for column, continuous in enumerate(self.continuous) if not continuous
+        ]
+        self.number_variables: int = len(names)
+        self.number_rows: int = len(row_names)
+
+        # pre-normalized comparison operators
+        self.signs: array = array("d")
+        self.limits: array = array("d")
+        self.strict: List[bool] = []
+        for comparison_operator, value in zip(comparison_operators, constraint_values):
+            if comparison_operator == "<=":
+                self.signs.append(1.0)
+                self.limits.append(value + epsilon)
+                self.strict.append(False)
+            if comparison_operator == "<":
+                self.signs.append(1.0)
+                self.limits.append(value)
+                self.strict.append(True)
+            if comparison_operator == ">=":
+                self.signs.append(-1.0)
+                self.limits.append(-(value - epsilon))
+                self.strict.append(False)
+            if comparison_operator == ">":
+                self.signs.append(-1.0)
+                self.limits.append(-value)
+                self.strict.append(True)
+
+        # column-wise view: (row, cost) pairs per decision variable
+        self.columns: List[List[Tuple[int, float]]] = [
+            [] for _ in range(self.number_variables)
+        ]
+        for row in range(self.number_rows):
+            for column, cost in self.row(row):
+                self.columns[column].append((row, cost))
+
+    @classmethod
+    def compile(
+        cls,
+        criterion: str,
+        decision_variables: List[DecisionVariable],
+        constraint_variables: Optional[dict],
+        epsilon: float,
+    ) -> "CompiledModel":
+        """Compile decision variables (list order) and constraint variables (dict order)."""
+        index_map = {
+            decision_variable.name: index
+            for index, decision_variable in enumerate(decision_variables)
+        }
+        row_names = []
+        row_starts = [0]
+        row_columns = []
+        row_costs = []
+        comparison_operators = []
+        constraint_values = []
+        if constraint_variables is not None:
+            for constraint_variable in constraint_variables.values():
+                row_names.append(constraint_variable.name)
+                for dv_name, dv_cost in constraint_variable.dependencies:
+                    row_columns.append(index_map[dv_name])
+                    row_costs.append(dv_cost)
+                row_starts.append(len(row_columns))
+                comparison_operators.append(constraint_variable.comparison_operator)
+                constraint_values.append(constraint_variable.constraint_value)
+        return cls(
+            criterion=criterion,
+            names=[dv.name for dv in decision_variables],
+            unit_profits=[dv.unit_profit for dv in decision_variables],
+            lower_bounds=[dv.lower_bound for dv in decision_variables],
+            upper_bounds=[dv.upper_bound for dv in decision_variables],
+            row_names=row_names,
+            row_starts=row_starts,
+            row_columns=row_columns,
+            row_costs=row_costs,
+            comparison_operators=comparison_operators,
+            constraint_values=constraint_values,
+            epsilon=epsilon,
+            continuous=[dv.continuous for dv in decision_variables],
+        )
+
+    def with_bounds(self, lower_bounds: List[int], upper_bounds: List[int]) -> "CompiledModel":
+        """Copy of the model with other decision variable bounds (e.g. search space shards)."""
+        return CompiledModel(
+            criterion=self.criterion,
+            names=self.names,
+            unit_profits=self.unit_profits,
+            lower_bounds=list(lower_bounds),
+            upper_bounds=list(upper_bounds),
+            row_names=self.row_names,
+            row_starts=self.row_starts,
+            row_columns=self.row_columns,
+            row_costs=self.row_costs,
+            comparison_operators=self.comparison_operators,
+            constraint_values=self.constraint_values,
+            epsilon=self.epsilon,
+            continuous=self.continuous,
+        )
+
+    def with_constraint_value(self, row: int, constraint_value: float) -> "CompiledModel":
+        """Copy of the model with another right-hand side of a constraint row."""
+        constraint_values = list(self.constraint_values)
+        constraint_values[row] = float(constraint_value)
+        return CompiledModel(
+            criterion=self.criterion,
+            names=self.names,
+            unit_profits=self.unit_profits,
+            lower_bounds=self.lower_bounds,
+            upper_bounds=self.upper_bounds,
+            row_names=self.row_names,
+            row_starts=self.row_starts,
+            row_columns=self.row_columns,
+            row_costs=self.row_costs,
+            comparison_operators=self.comparison_operators,
+            constraint_values=constraint_values,
+            epsilon=self.epsilon,
+            continuous=self.continuous,
+        )
+
+    def to_variables(self) -> Tuple[dict, Optional[dict]]:
+        """Decompile to decision variables and constraint variables."""
+        decision_variables: dict = {}
+        for index, name in enumerate(self.names):
+            decision_variable = DecisionVariable(
+                name=name,
+                unit_profit=self.unit_profits[index],
+                continuous=self.continuous[index],
+            )
+            decision_variable.apply_constraint(">=", self.lower_bounds[index])
+            decision_variable.apply_constraint("<=", self.upper_bounds[index])
+            decision_variables[name] = decision_variable
+        if self.number_rows == 0:
+            return decision_variables, None
+        constraint_variables: dict = {}
+        for row, name in enumerate(self.row_names):
+            constraint_variables[name] = ConstraintVariable(
+                name=name,
+                dependencies=[(self.names[column], cost) for column, cost in self.row(row)],
+                comparison_operator=self.comparison_operators[row],
+                constraint_value=self.constraint_values[row],
+            )
+        return decision_variables, constraint_variables
+
+    def row(self, row: int) -> List[Tuple[int, float]]:
+        """(column, cost) pairs of a constraint row in dependency order."""
+        start, end = self.row_starts[row], self.row_starts[row + 1]
+        return list(zip(self.row_columns[start:end], self.row_costs[start:end]))
+
+    def dense_rows(self) -> List[List[float]]:
+        """Constraint coefficient matrix as dense rows."""
+        rows = []
+        for row in range(self.number_rows):
+            costs = [0.0] * self.number_variables
+            for column, cost in self.row(row):
+                costs[column] = cost
+            rows.append(costs)
+        return rows
+
+    def relaxation_rows(self) -> List[Tuple[List[float], float]]:
+        """Constraint rows as sign * row * dv_values <= limit (strict rows relaxed)."""
+        return [
+            ([self.signs[row] * cost for cost in costs], self.limits[row])
+            for row, costs in enumerate(self.dense_rows())
+        ]
+
+    def lp_rows(self) -> List[Tuple[List[float], float]]:
+        """Constraint rows as sign * row * dv_values <= limit - epsilon.
+
+        Solutions of these rows satisfy is_feasible(): non-strict rows hold exactly,
+        strict rows hold with an epsilon margin.
+        """
+        return [
+            (coefficients, limit - self.epsilon)
+            for coefficients, limit in self.relaxation_rows()
+        ]
+
+    def is_mixed(self) -> bool:
+        """Check if the model has continuous decision variables."""
+        return len(self.integer_columns) < self.number_variables
+
+    def is_violated(self, row: int, sum_left: float) -> bool:
+        """Check if the left sum of a constraint row violates its bound."""
+        if self.strict[row]:
+            return self.signs[row] * sum_left >= self.limits[row]
+        return self.signs[row] * sum_left > self.limits[row]
+
+    def row_activity(self, row: int, dv_values: List[int]) -> float:
+        """Left sum of a constraint row given decision variable values."""
+        _sum = 0.0
+        for index in range(self.row_starts[row], self.row_starts[row + 1]):
+            _sum += dv_values[self.row_columns[index]] * self.row_costs[index]
+        return _sum
+
+    def is_feasible(self, dv_values: List[int]) -> bool:
+        """Check if decision variable values satisfy all constraint rows."""
+        for row in range(self.number_rows):
+            if self.is_violated(row, self.row_activity(row, dv_values)):
+                return False
+        return True
+
+    def objective_value(self, dv_values: List[int]) -> float:
+        """Objective value given decision variable values."""
+        result = 0.0
+        for unit_profit, dv_value in zip(self.unit_profits, dv_values):
+            result += unit_profit * dv_value
+        return result
+
+    def search_space_size(self) -> int:
+        """Number of integer points within the bounds of the integer decision variables."""
+        size = 1
+        for column in self.integer_columns:
+            size *= max(self.upper_bounds[column] - self.lower_bounds[column] + 1, 0)
+        return size
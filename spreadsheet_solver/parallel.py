@@ -0,0 +1,135 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from spreadsheet_solver.model import CompiledModel
+from spreadsheet_solver.solver import Solver, Timeout
+from spreadsheet_solver.stats import SolverStatistics
+
+# shards per worker, more shards balance uneven subtrees
+SHARDS_PER_WORKER: int = 4
+
+# shared incumbent of the current worker process, set by the pool initializer
+_shared_incumbent = None
+
+
+class SharedIncumbent:
+    """Best objective (w.r.t. maximization) shared between worker processes."""
+
+    def __init__(self, value) -> None:
+        """Construct shared incumbent of a multiprocessing.Value."""
+        self.value = value
+
+    def get(self) -> float:
+        """Get best objective found so far."""
+        return self.value.value
+
+    def offer(self, objective: float) -> None:
+        """Offer objective of a feasible solution, kept if it improves the incumbent."""
+        with self.value.get_lock():
+            if objective > self.value.value:
+                self.value.value = objective
+
+
+def shard_model(model: CompiledModel, number_shards: int) -> List[CompiledModel]:
+    """Split the range of the outermost integer decision variable into contiguous shards."""
+    column = model.integer_columns[0]
+    lower_bound, upper_bound = model.lower_bounds[column], model.upper_bounds[column]
+    width = upper_bound - lower_bound + 1
+    number_shards = max(min(number_shards, width), 1)
+    shards = []
+    for shard in range(number_shards):
+        lower_bounds = list(model.lower_bounds)
+        upper_bounds = list(model.upper_bounds)
+        lower_bounds[column] = lower_bound + (width * shard) // number_shards
+        upper_bounds[column] = lower_bound + (width * (shard + 1)) // number_shards - 1
+        shards.append(model.with_bounds(lower_bounds, upper_bounds))
+    return shards
+
+
+def init_worker(value) -> None:
+    """Pool initializer, attach shared incumbent to worker process."""
+    global _shared_incumbent
+    _shared_incumbent = SharedIncumbent(value)
+
+
+def search_shard(
+    model: CompiledModel, engine: str, deadline: float, collect_stats: bool = False
+) -> Tuple[Optional[float], List[int], bool, int, Optional[dict]]:
+    """Solve shard of the search space in a worker process.
+
+    Returns optimum, optimal decision variable values, whether the optimum is proven,
+    the number of explored points of the shard and its statistics (if collected).
+    """
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        return None, [], False, 0, None
+    solver = Solver.from_model(model, timeout=remaining, engine=engine)
+    solver.shared_incumbent = _shared_incumbent
+    if collect_stats:
+        solver.stats = SolverStatistics()
+    try:
+        solver.solve()
+    except Timeout:
+        return None, [], False, solver.explored, shard_stats(solver)
+    return (
+        solver.optimum,
+        solver.optimal_decision_variable_values,
+        solver.proven,
+        solver.explored,
+        shard_stats(solver),
+    )
+
+
+def shard_stats(solver: Solver) -> Optional[dict]:
+    """Statistics of a shard solver as picklable dict, None if not collected."""
+    if solver.stats is None:
+        return None
+    return solver.stats.to_dict()
+
+
+def parallel_search(solver: Solver) -> None:
+    """Search the solver model with a pool of worker processes, merge shard results."""
+    model = solver.model
+    if model.number_variables <= 0:
+        return
+    shards = shard_model(model, solver.workers * SHARDS_PER_WORKER)
+    shared = multiprocessing.Value("d", -math.inf)
+    # wall clock deadline, monotonic clocks are not comparable between processes
+    deadline = time.time() + (solver.deadline - time.monotonic())
+    proven = True
+    with ProcessPoolExecutor(
+        max_workers=solver.workers, initializer=init_worker, initargs=(shared,)
+    ) as executor:
+        futures = [
+            executor.submit(
+                search_shard, shard, solver.engine, deadline, solver.stats is not None
+            )
+            for shard in shards
+        ]
+        # merge in shard order, ties are broken like in the serial engines
+        for future in futures:
+            optimum, optimal_decision_variable_values, shard_proven, explored, stats = (
+                future.result()
+            )
+            proven = proven and shard_proven
+            solver.explored += explored
+            if stats is not None:
+                solver.stats.merge(stats)
+            if optimum is None:
+                continue
+            if solver.is_better_solution(optimum, optimal_decision_variable_values):
+                solver.optimum = optimum
+                solver.optimal_decision_variable_values = optimal_decision_variable_values
+    if not proven:
+        raise Timeout(f"Solver function timed out after {solver.timeout} seconds.")
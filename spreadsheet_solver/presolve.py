@@ -0,0 +1,355 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import math
+from typing import Dict, List, Optional
+
+from spreadsheet_solver.data_types import ConstraintVariable, DecisionVariable
+from spreadsheet_solver.model import CompiledModel
+from spreadsheet_solver.solver import Solver
+
+# upper bound for propagation rounds, integer bounds shrink by at least one per round
+MAX_ROUNDS: int = 1000
+
+# integer objectives and row activities below this magnitude are exact as float
+MAX_EXACT: int = 1 << 53
+
+
+class Infeasible(Exception):
+    """Exception raised when presolve proves that the optimization problem has no solution."""
+
+    def __init__(self, message="Optimization problem is infeasible."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class PresolveReport:
+    """Summary of the presolve stage."""
+
+    def __init__(self, size_before: float, size_after: int, rounds: int) -> None:
+        """Construct presolve report, size_before is infinite if bounds were missing."""
+        self.size_before: float = size_before
+        self.size_after: int = size_after
+        self.rounds: int = rounds
+
+    def __str__(self) -> str:
+        """String representation of presolve report."""
+        if math.isinf(self.size_before):
+            return (
+                f"Presolve: derived missing bounds, search space of {self.size_after} points "
+                f"in {self.rounds} rounds."
+            )
+        return (
+            f"Presolve: search space reduced from {self.size_before} to {self.size_after} "
+            f"points ({self.size_before / max(self.size_after, 1):.1f}x) in {self.rounds} rounds."
+        )
+
+
+def presolve(
+    decision_variables: dict, constraint_variables: Optional[dict]
+) -> Optional[PresolveReport]:
+    """Tighten decision variable bounds inplace by propagating all constraint rows.
+
+    Missing bounds count as infinite, they are derived from rows in which all other
+    decision variables are bounded. Returns None if some decision variable still lacks a
+    bound (left to the solver validation).
+    """
+    model = CompiledModel.compile(
+        criterion="max",
+        decision_variables=list(decision_variables.values()),
+        constraint_variables=constraint_variables,
+        epsilon=Solver.epsilon_comp_val(),
+    )
+    lower = [-math.inf if bound is None else bound for bound in model.lower_bounds]
+    upper = [math.inf if bound is None else bound for bound in model.upper_bounds]
+    size_before = search_space_size(model, lower, upper)
+    # rows as sum(cost * dv_value) <= limit, strict rows relaxed
+    rows = [
+        [(column, model.signs[row] * cost) for column, cost in model.row(row) if cost != 0.0]
+        for row in range(model.number_rows)
+    ]
+
+    rounds = 0
+    changed = True
+    while changed and rounds < MAX_ROUNDS:
+        changed = False
+        rounds += 1
+        for row, costs in enumerate(rows):
+            # minimal activity of the row given current bounds, columns of infinite terms
+            minimal_activity = 0.0
+            unbounded = []
+            for column, cost in costs:
+                term = min(cost * lower[column], cost * upper[column])
+                if math.isinf(term):
+                    unbounded.append(column)
+                else:
+                    minimal_activity += term
+            slack = model.limits[row] - minimal_activity
+            if not unbounded and slack < -model.epsilon:
+                raise Infeasible(
+                    (
+                        f"Presolve proved the optimization problem to be infeasible. "
+                        f"The constraint variable {model.row_names[row]} can not be "
+                        f"satisfied within the bounds of its decision variables."
+                    )
+                )
+            if len(unbounded) > 1:
+                continue
+            for column, cost in costs:
+                if unbounded and column != unbounded[0]:
+                    continue
+                # bound opposite to the tightened one, the row reads cost * dv_value <= residual
+                other = lower[column] if cost > 0 else upper[column]
+                residual = slack if unbounded else slack + cost * other
+                if model.continuous[column]:
+                    # continuous bounds would shrink by arbitrarily small steps, left to the LP,
+                    # only missing ones are derived
+                    if cost > 0 and math.isinf(upper[column]):
+                        upper[column] = residual / cost
+                        changed = True
+                    elif cost < 0 and math.isinf(lower[column]):
+                        lower[column] = residual / cost
+                        changed = True
+                elif unbounded:
+                    # tolerance guards against rounding away feasible integer values
+                    reach = residual / cost
+                    if cost > 0:
+                        new_upper = math.floor(reach + 1e-9 * max(1.0, abs(reach)))
+                        if new_upper < upper[column]:
+                            upper[column] = new_upper
+                            changed = True
+                    else:
+                        new_lower = math.ceil(reach - 1e-9 * max(1.0, abs(reach)))
+                        if new_lower > lower[column]:
+                            lower[column] = new_lower
+                            changed = True
+                else:
+                    reach = slack / abs(cost)
+                    reach += 1e-9 * max(1.0, abs(reach))
+                    if cost > 0:
+                        new_upper = other + math.floor(reach)
+                        if new_upper < upper[column]:
+                            upper[column] = new_upper
+                            changed = True
+                    else:
+                        new_lower = other - math.floor(reach)
+                        if new_lower > lower[column]:
+                            lower[column] = new_lower
+                            changed = True
+                if lower[column] > upper[column]:
+                    raise Infeasible(
+                        (
+                            f"Presolve proved the optimization problem to be infeasible. "
+                            f"The constraint variable {model.row_names[row]} leaves no "
+                            f"value for the decision variable {model.names[column]}."
+                        )
+                    )
+
+    for column, decision_variable in enumerate(decision_variables.values()):
+        if not math.isinf(lower[column]):
+            decision_variable.apply_constraint(">=", lower[column])
+        if not math.isinf(upper[column]):
+            decision_variable.apply_constraint("<=", upper[column])
+    if any(math.isinf(bound) for bound in lower + upper):
+        return None
+    return PresolveReport(size_before, search_space_size(model, lower, upper), rounds)
+
+
+def search_space_size(model: CompiledModel, lower: List[float], upper: List[float]) -> float:
+    """Number of integer points within bounds, infinite if an integer bound is missing."""
+    if any(
+        math.isinf(lower[column]) or math.isinf(upper[column])
+        for column in model.integer_columns
+    ):
+        return math.inf
+    return model.with_bounds(lower, upper).search_space_size()
+
+
+class Reduction:
+    """Decision variables fixed at their optimal bound and identical columns merged.
+
+    The reduced problem is solved instead of the original one, postsolve() splits its
+    solution back into the original decision variables.
+    """
+
+    def __init__(
+        self,
+        decision_variables: dict,
+        constraint_variables: Optional[dict],
+        reduced_decision_variables: dict,
+        reduced_constraint_variables: Optional[dict],
+        fixed: Dict[str, int],
+        groups: List[List[str]],
+    ) -> None:
+        """Construct reduction, groups are named by their first decision variable."""
+        self.decision_variables: dict = decision_variables
+        self.constraint_variables: Optional[dict] = constraint_variables
+        self.reduced_decision_variables: dict = reduced_decision_variables
+        self.reduced_constraint_variables: Optional[dict] = reduced_constraint_variables
+        self.fixed: Dict[str, int] = fixed
+        self.groups: List[List[str]] = groups
+
+    def __str__(self) -> str:
+        """String representation of reduction."""
+        merged = sum(len(group) for group in self.groups)
+        return (
+            f"Presolve: fixed {len(self.fixed)} decision variables at their optimal bound, "
+            f"merged {merged} identical decision variables into {len(self.groups)}."
+        )
+
+    def postsolve(self, solver: Solver) -> Solver:
+        """Solver of the original problem holding the split solution of the reduced one."""
+        original = Solver(
+            timeout=solver.timeout,
+            criterion=solver.criterion,
+            decision_variables=self.decision_variables,
+            constraint_variables=self.constraint_variables,
+            engine=solver.engine,
+            workers=solver.workers,
+        )
+        original.stats = solver.stats
+        original.proven = solver.proven
+        original.selected_engine = solver.selected_engine
+        original.explored = solver.explored
+        if solver.optimum is None:
+            return original
+        dv_values = dict(zip(solver.model.names, solver.optimal_decision_variable_values))
+        for group in self.groups:
+            # smallest values first: the split brute-force would have found first
+            remaining = dv_values[group[0]]
+            for index, dv_name in enumerate(group):
+                decision_variable = self.decision_variables[dv_name]
+                capacity = sum(
+                    self.decision_variables[following].upper_bound
+                    for following in group[index + 1 :]
+                )
+                dv_values[dv_name] = max(decision_variable.lower_bound, remaining - capacity)
+                remaining -= dv_values[dv_name]
+        original.optimal_decision_variable_values = [
+            dv_values[dv_name] for dv_name in original.model.names
+        ]
+        original.optimum = original.model.objective_value(
+            original.optimal_decision_variable_values
+        )
+        original.set_optimal_decision_variable_values()
+        return original
+
+
+def reduce_columns(
+    criterion: str, decision_variables: dict, constraint_variables: Optional[dict]
+) -> Optional[Reduction]:
+    """Fix unconstrained/dominated decision variables and merge identical columns.
+
+    A decision variable is fixed at its upper (lower) bound if raising (lowering) it
+    never violates a row and improves the objective, or at its lower bound if lowering
+    it never violates a row and keeps the objective. Runs of decision variables with
+    equal profits and costs (only fixed ones in between) are merged into their sum.
+    Both keep the tie rule of brute-force (lexicographically smallest optimal point),
+    hence they require integer profits/costs (exact float sums) and integer models.
+    Returns None if nothing can be reduced.
+    """
+    if any(
+        decision_variable.lower_bound is None
+        or decision_variable.upper_bound is None
+        or decision_variable.continuous
+        for decision_variable in decision_variables.values()
+    ):
+        return None
+    model = CompiledModel.compile(
+        criterion=criterion,
+        decision_variables=list(decision_variables.values()),
+        constraint_variables=constraint_variables,
+        epsilon=Solver.epsilon_comp_val(),
+    )
+    magnitude = sum(
+        abs(model.unit_profits[column])
+        * max(abs(model.lower_bounds[column]), abs(model.upper_bounds[column]))
+        for column in range(model.number_variables)
+    )
+    if magnitude >= MAX_EXACT or not all(
+        float(unit_profit).is_integer() for unit_profit in model.unit_profits
+    ):
+        return None
+    sense = 1.0 if criterion == "max" else -1.0
+    lower = list(model.lower_bounds)
+    upper = list(model.upper_bounds)
+
+    fixed: Dict[str, int] = {}
+    for column in range(model.number_variables):
+        if lower[column] == upper[column]:
+            continue
+        # normalized costs, i.e. rows read sum(cost * dv_value) <= limit
+        costs = [model.signs[row] * cost for row, cost in model.columns[column]]
+        profit = sense * model.unit_profits[column]
+        if profit > 0 and all(cost <= 0 for cost in costs):
+            lower[column] = upper[column]
+        elif profit <= 0 and all(cost >= 0 for cost in costs):
+            upper[column] = lower[column]
+        else:
+            continue
+        fixed[model.names[column]] = lower[column]
+
+    groups: List[List[str]] = []
+    previous = None
+    for column in range(model.number_variables):
+        if lower[column] == upper[column]:
+            continue
+        signature = (model.unit_profits[column], tuple(model.columns[column]))
+        activity = sum(
+            abs(cost) * max(abs(lower[column]), abs(upper[column]))
+            for _, cost in model.columns[column]
+        )
+        if not all(float(cost).is_integer() for _, cost in model.columns[column]) or (
+            activity >= MAX_EXACT
+        ):
+            signature = None
+        if signature is not None and previous is not None and signature == previous[0]:
+            previous[1].append(model.names[column])
+        else:
+            previous = (signature, [model.names[column]])
+            groups.append(previous[1])
+        if signature is None:
+            previous = None
+    groups = [group for group in groups if len(group) > 1]
+    if not fixed and not groups:
+        return None
+
+    merged = {dv_name: group for group in groups for dv_name in group}
+    index_map = {dv_name: column for column, dv_name in enumerate(model.names)}
+    reduced_decision_variables: dict = {}
+    for column, decision_variable in enumerate(decision_variables.values()):
+        members = merged.get(decision_variable.name, [decision_variable.name])
+        if members[0] != decision_variable.name:
+            continue
+        reduced = DecisionVariable(name=decision_variable.name, unit_profit=decision_variable.unit_profit)
+        reduced.apply_constraint(">=", sum(lower[index_map[member]] for member in members))
+        reduced.apply_constraint("<=", sum(upper[index_map[member]] for member in members))
+        reduced_decision_variables[reduced.name] = reduced
+    reduced_constraint_variables = None
+    if constraint_variables is not None:
+        reduced_constraint_variables = {
+            name: ConstraintVariable(
+                name=name,
+                dependencies=[
+                    (dv_name, dv_cost)
+                    for dv_name, dv_cost in constraint_variable.dependencies
+                    if dv_name in reduced_decision_variables
+                ],
+                comparison_operator=constraint_variable.comparison_operator,
+                constraint_value=constraint_variable.constraint_value,
+            )
+            for name, constraint_variable in constraint_variables.items()
+        }
+    return Reduction(
+        decision_variables,
+        constraint_variables,
+        reduced_decision_variables,
+        reduced_constraint_variables,
+        fixed,
+        groups,
+    )
@@ -0,0 +1,486 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import math
+import re
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from spreadsheet_solver import InvalidConfig
+
+# timeout of models read from MPS/LP files, these formats carry no solver settings
+DEFAULT_TIMEOUT: int = 100
+
+# mps section headers
+MPS_SECTIONS: List[str] = [
+    "NAME",
+    "OBJSENSE",
+    "ROWS",
+    "COLUMNS",
+    "RHS",
+    "RANGES",
+    "BOUNDS",
+    "ENDATA",
+]
+
+# lp format tokens: number, comparison operator, sign, colon or name
+LP_TOKEN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<operator><=|=<|>=|=>|<|>|=)"
+    r"|(?P<sign>[+-])"
+    r"|(?P<colon>:)"
+    r"|(?P<name>[A-Za-z_!\"#$%&()/,.;?@`'{}|~][\w!\"#$%&()/,.;?@`'{}|~\[\]]*))"
+)
+
+# lp format section keywords at the start of a line
+LP_SECTION = re.compile(
+    r"^\s*(maximi[sz]e|maximum|max|minimi[sz]e|minimum|min|subject\s+to|such\s+that|st|s\.t\."
+    r"|bounds?|generals?|gen|integers?|binary|binaries|bin|semi-continuous|semis?|sos|end)"
+    r"(?![\w.])(.*)$",
+    re.IGNORECASE,
+)
+
+
+class ModelBuilder:
+    """Collects a model read from a file and converts it into config data."""
+
+    def __init__(self, path: str) -> None:
+        """Construct empty model."""
+        self.path: str = path
+        self.criterion: str = "min"
+        # objective coefficient per column, columns in order of appearance
+        self.columns: Dict[str, float] = {}
+        self.integer: Set[str] = set()
+        self.lower: Dict[str, Optional[float]] = {}
+        self.upper: Dict[str, Optional[float]] = {}
+        # (name, coefficients, comparison operator, value), "=" is split on conversion
+        self.rows: List[Tuple[str, Dict[str, float], str, float]] = []
+
+    def add_column(self, name: str) -> None:
+        """Register column with default bounds [0, inf)."""
+        if name not in self.columns:
+            self.columns[name] = 0.0
+            self.lower[name] = 0.0
+            self.upper[name] = None
+
+    def error(self, message: str) -> InvalidConfig:
+        """Parse error of the model file."""
+        return InvalidConfig(
+            f"An error occurred while trying to parse the model file {self.path}. {message}"
+        )
+
+    def to_config_data(self) -> dict:
+        """Model as data of a yaml config, see configs/README.yaml."""
+        decision_variables = []
+        decision_variable_constraints = []
+        for name, unit_profit in self.columns.items():
+            lower, upper = self.lower[name], self.upper[name]
+            if name in self.integer:
+                decision_variables.append([name, unit_profit])
+                # integer values within fractional bounds
+                lower = math.ceil(lower - 1e-9) if lower is not None else None
+                upper = math.floor(upper + 1e-9) if upper is not None else None
+            else:
+                decision_variables.append([name, unit_profit, "continuous"])
+            if lower is not None:
+                decision_variable_constraints.append([name, ">=", lower])
+            if upper is not None:
+                decision_variable_constraints.append([name, "<=", upper])
+        constraint_variables = []
+        for name, coefficients, comparison_operator, value in self.rows:
+            dependencies = [[column, cost] for column, cost in coefficients.items()]
+            if comparison_operator == "=":
+                constraint_variables.append([name, dependencies, ">=", value])
+                constraint_variables.append([f"{name}_upper", dependencies, "<=", value])
+            else:
+                constraint_variables.append([name, dependencies, comparison_operator, value])
+        solver: dict = {}
+        if not self.integer:
+            solver["engine"] = "lp"
+        elif len(self.integer) < len(self.columns):
+            solver["engine"] = "bnb"
+        return {
+            "timeout": DEFAULT_TIMEOUT,
+            "criterion": self.criterion,
+            "solver": solver,
+            "decision_variables": decision_variables,
+            "decision_variable_constraints": decision_variable_constraints,
+            "constraint_variables": constraint_variables or None,
+        }
+
+
+def read_mps(path: str) -> dict:
+    """Read (free or fixed without spaces in names) MPS file line by line into config data.
+
+    Supported: OBJSENSE, ROWS (N, L, G, E), COLUMNS with integer markers, RHS, RANGES
+    and BOUNDS (UP, LO, FX, FR, MI, PL, BV, LI, UI). The objective constant is ignored.
+    """
+    model = ModelBuilder(path)
+    section = None
+    objective: Optional[str] = None
+    # comparison operator and right-hand side per constraint row, free rows are skipped
+    row_types: Dict[str, str] = {}
+    free_rows: Set[str] = set()
+    coefficients: Dict[str, Dict[str, float]] = {}
+    rhs: Dict[str, float] = {}
+    ranges: Dict[str, float] = {}
+    integer_marker = False
+    with open(path, "r") as file:
+        for line in file:
+            if not line.strip() or line.startswith("*"):
+                continue
+            tokens = line.split()
+            # section headers start in the first column, data lines are indented
+            if not line[0].isspace() and tokens[0].upper() in MPS_SECTIONS:
+                section = tokens[0].upper()
+                if section == "OBJSENSE" and len(tokens) > 1:
+                    model.criterion = mps_criterion(model, tokens[1])
+                if section == "ENDATA":
+                    break
+                continue
+            if section == "OBJSENSE":
+                model.criterion = mps_criterion(model, tokens[0])
+            elif section == "ROWS":
+                row_type, name = tokens[0].upper(), tokens[1]
+                if row_type == "N":
+                    if objective is None:
+                        objective = name
+                    else:
+                        free_rows.add(name)
+                elif row_type in ["L", "G", "E"]:
+                    row_types[name] = row_type
+                    coefficients[name] = {}
+                else:
+                    raise model.error(f'The row type "{row_type}" is not supported.')
+            elif section == "COLUMNS":
+                if len(tokens) >= 3 and tokens[1].strip("'\"").upper() == "MARKER":
+                    integer_marker = tokens[2].strip("'\"").upper() == "INTORG"
+                    continue
+                column = tokens[0]
+                model.add_column(column)
+                if integer_marker:
+                    model.integer.add(column)
+                for row, value in mps_pairs(model, tokens[1:]):
+                    if row == objective:
+                        model.columns[column] += value
+                    elif row in coefficients:
+                        coefficients[row][column] = coefficients[row].get(column, 0.0) + value
+                    elif row not in free_rows:
+                        raise model.error(f"The row {row} needs to be defined in ROWS.")
+            elif section in ["RHS", "RANGES"]:
+                # the vector name is optional
+                pairs = tokens[1:] if len(tokens) % 2 == 1 else tokens
+                for row, value in mps_pairs(model, pairs):
+                    if row == objective or row in free_rows:
+                        continue
+                    if row not in row_types:
+                        raise model.error(f"The row {row} needs to be defined in ROWS.")
+                    (rhs if section == "RHS" else ranges)[row] = value
+            elif section == "BOUNDS":
+                mps_bound(model, tokens)
+            else:
+                raise model.error(f"The line {line.strip()} is outside of any section.")
+
+    # comparison operators, ranges turn rows into two-sided rows
+    for row, row_type in row_types.items():
+        value = rhs.get(row, 0.0)
+        if row not in ranges:
+            comparison_operator = {"L": "<=", "G": ">=", "E": "="}[row_type]
+            model.rows.append((row, coefficients[row], comparison_operator, value))
+            continue
+        span = ranges[row]
+        if row_type == "L":
+            lower, upper = value - abs(span), value
+        elif row_type == "G":
+            lower, upper = value, value + abs(span)
+        else:
+            lower, upper = (value, value + span) if span >= 0 else (value + span, value)
+        model.rows.append((row, coefficients[row], ">=", lower))
+        model.rows.append((f"{row}_upper", coefficients[row], "<=", upper))
+    return model.to_config_data()
+
+
+def mps_criterion(model: ModelBuilder, sense: str) -> str:
+    """Criterion of an OBJSENSE entry."""
+    if sense.upper() in ["MAX", "MAXIMIZE"]:
+        return "max"
+    if sense.upper() in ["MIN", "MINIMIZE"]:
+        return "min"
+    raise model.error(f'The objective sense "{sense}" is not supported.')
+
+
+def mps_pairs(model: ModelBuilder, tokens: List[str]) -> Iterator[Tuple[str, float]]:
+    """(row, value) pairs of an MPS data line."""
+    if len(tokens) % 2 != 0:
+        raise model.error(f"The entries {' '.join(tokens)} need to be row and value pairs.")
+    for index in range(0, len(tokens), 2):
+        yield tokens[index], mps_number(model, tokens[index + 1])
+
+
+def mps_number(model: ModelBuilder, token: str) -> float:
+    """Parse number of an MPS data line."""
+    try:
+        return float(token)
+    except ValueError:
+        raise model.error(f'The value "{token}" needs to be a number.')
+
+
+def mps_bound(model: ModelBuilder, tokens: List[str]) -> None:
+    """Apply an MPS bound line (type, optional vector name, column, value)."""
+    bound_type = tokens[0].upper()
+    with_value = bound_type in ["UP", "LO", "FX", "LI", "UI"]
+    # the vector name is optional
+    if with_value:
+        column, value = tokens[-2], mps_number(model, tokens[-1])
+    else:
+        column, value = tokens[-1], None
+    if column not in model.columns:
+        raise model.error(f"The column {column} needs to be defined in COLUMNS.")
+    if bound_type in ["LI", "UI", "BV"]:
+        model.integer.add(column)
+    if bound_type in ["UP", "UI"]:
+        model.upper[column] = value
+        # convention: a negative upper bound without lower bound frees the lower bound
+        if value < 0 and model.lower[column] == 0.0:
+            model.lower[column] = None
+    elif bound_type in ["LO", "LI"]:
+        model.lower[column] = value
+    elif bound_type == "FX":
+        model.lower[column] = value
+        model.upper[column] = value
+    elif bound_type == "FR":
+        model.lower[column] = None
+        model.upper[column] = None
+    elif bound_type == "MI":
+        model.lower[column] = None
+    elif bound_type == "PL":
+        model.upper[column] = None
+    elif bound_type == "BV":
+        model.lower[column] = 0.0
+        model.upper[column] = 1.0
+    else:
+        raise model.error(f'The bound type "{bound_type}" is not supported.')
+
+
+def lp_tokens(model: ModelBuilder, text: str) -> Iterator[Tuple[str, str]]:
+    """(kind, token) pairs of a line of an LP file."""
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = LP_TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise model.error(f'The expression "{text[position:].strip()}" can not be parsed.')
+        position = match.end()
+        yield match.lastgroup, match.group(match.lastgroup)
+
+
+def read_lp(path: str) -> dict:
+    """Read CPLEX LP file line by line into config data.
+
+    Supported sections: objective (maximize/minimize), subject to, bounds, general and
+    binary. Constraints are parsed as soon as they are complete, "<" means "<=" in LP
+    files. The objective constant is ignored.
+    """
+    model = ModelBuilder(path)
+    section = None
+    # tokens of the current statement (constraints) or section (all other sections)
+    pending: List[Tuple[str, str]] = []
+    with open(path, "r") as file:
+        for line in file:
+            # backslash starts a comment
+            line = line.split("\\", 1)[0]
+            if not line.strip():
+                continue
+            match = LP_SECTION.match(line)
+            if match is not None:
+                lp_flush(model, section, pending)
+                pending = []
+                keyword = " ".join(match.group(1).lower().split())
+                section = lp_section(model, keyword)
+                if section == "end":
+                    break
+                line = match.group(2)
+            if section is None:
+                raise model.error("The file needs to start with maximize or minimize.")
+            for token in lp_tokens(model, line):
+                pending.append(token)
+                if section == "constraints" and lp_is_complete(pending):
+                    lp_constraint(model, pending)
+                    pending = []
+        lp_flush(model, section, pending)
+    return model.to_config_data()
+
+
+def lp_section(model: ModelBuilder, keyword: str) -> str:
+    """Section of an LP section keyword."""
+    if keyword in ["maximize", "maximise", "maximum", "max"]:
+        model.criterion = "max"
+        return "objective"
+    if keyword in ["minimize", "minimise", "minimum", "min"]:
+        model.criterion = "min"
+        return "objective"
+    if keyword in ["subject to", "such that", "st", "s.t."]:
+        return "constraints"
+    if keyword in ["bound", "bounds"]:
+        return "bounds"
+    if keyword in ["general", "generals", "gen", "integer", "integers"]:
+        return "general"
+    if keyword in ["binary", "binaries", "bin"]:
+        return "binary"
+    if keyword == "end":
+        return "end"
+    raise model.error(f'The section "{keyword}" is not supported.')
+
+
+def lp_flush(model: ModelBuilder, section: Optional[str], tokens: List[Tuple[str, str]]) -> None:
+    """Parse the collected tokens of a finished section."""
+    if not tokens:
+        return
+    if section == "objective":
+        if len(tokens) >= 2 and tokens[1][0] == "colon":
+            tokens = tokens[2:]
+        coefficients, _ = lp_expression(model, tokens)
+        for column, cost in coefficients.items():
+            model.add_column(column)
+            model.columns[column] += cost
+    elif section == "constraints":
+        raise model.error("The last constraint is incomplete.")
+    elif section == "bounds":
+        lp_bounds(model, tokens)
+    elif section in ["general", "binary"]:
+        for kind, token in tokens:
+            if kind != "name":
+                raise model.error(f'The entry "{token}" needs to be a variable name.')
+            model.add_column(token)
+            model.integer.add(token)
+            if section == "binary":
+                model.lower[token] = 0.0
+                model.upper[token] = 1.0
+
+
+def lp_is_complete(tokens: List[Tuple[str, str]]) -> bool:
+    """Check if constraint tokens end with the right-hand side value."""
+    if tokens[-1][0] != "number" or len(tokens) < 2:
+        return False
+    previous = tokens[-2][0]
+    if previous == "sign" and len(tokens) >= 3:
+        previous = tokens[-3][0]
+    return previous == "operator"
+
+
+def lp_expression(
+    model: ModelBuilder, tokens: List[Tuple[str, str]]
+) -> Tuple[Dict[str, float], float]:
+    """Linear expression as coefficients per column and constant."""
+    coefficients: Dict[str, float] = {}
+    constant = 0.0
+    sign = 1.0
+    value: Optional[float] = None
+    for kind, token in tokens:
+        if kind == "sign":
+            if value is not None:
+                constant += sign * value
+                sign, value = 1.0, None
+            if token == "-":
+                sign = -sign
+        elif kind == "number":
+            if value is not None:
+                raise model.error(f'The number "{token}" needs to be preceded by a sign.')
+            value = float(token)
+        elif kind == "name":
+            coefficients[token] = coefficients.get(token, 0.0) + sign * (
+                value if value is not None else 1.0
+            )
+            sign, value = 1.0, None
+        else:
+            raise model.error(f'The token "{token}" is not allowed within an expression.')
+    if value is not None:
+        constant += sign * value
+    return coefficients, constant
+
+
+def lp_constraint(model: ModelBuilder, tokens: List[Tuple[str, str]]) -> None:
+    """Parse a complete constraint, i.e. [name:] expression operator value."""
+    name = f"c{len(model.rows) + 1}"
+    if len(tokens) >= 2 and tokens[0][0] == "name" and tokens[1][0] == "colon":
+        name, tokens = tokens[0][1], tokens[2:]
+    operator_index = max(
+        index for index, (kind, _) in enumerate(tokens) if kind == "operator"
+    )
+    coefficients, constant = lp_expression(model, tokens[:operator_index])
+    _, value = lp_expression(model, tokens[operator_index + 1 :])
+    for column in coefficients:
+        model.add_column(column)
+    comparison_operator = {"<=": "<=", "=<": "<=", "<": "<=", ">=": ">=", "=>": ">=", ">": ">="}.get(
+        tokens[operator_index][1], "="
+    )
+    model.rows.append((name, coefficients, comparison_operator, value - constant))
+
+
+def lp_value(
+    model: ModelBuilder, tokens: List[Tuple[str, str]], index: int
+) -> Tuple[Optional[float], int]:
+    """Parse [sign] (number | inf) of a bound, None for infinite values."""
+    sign = 1.0
+    if index < len(tokens) and tokens[index][0] == "sign":
+        sign = -1.0 if tokens[index][1] == "-" else 1.0
+        index += 1
+    if index >= len(tokens):
+        raise model.error("A bound is incomplete.")
+    kind, token = tokens[index]
+    if kind == "number":
+        return sign * float(token), index + 1
+    if kind == "name" and token.lower() in ["inf", "infinity"]:
+        return None, index + 1
+    raise model.error(f'The bound value "{token}" needs to be a number.')
+
+
+def lp_apply_bound(
+    model: ModelBuilder, column: str, comparison_operator: str, value: Optional[float]
+) -> None:
+    """Apply bound column (operator) value, value None is an infinite bound."""
+    model.add_column(column)
+    if comparison_operator in ["<=", "=<", "<"]:
+        model.upper[column] = value
+    elif comparison_operator in [">=", "=>", ">"]:
+        model.lower[column] = value
+    else:
+        model.lower[column] = value
+        model.upper[column] = value
+
+
+def lp_bounds(model: ModelBuilder, tokens: List[Tuple[str, str]]) -> None:
+    """Parse bounds section: x free, x op value, value op x [op value]."""
+    flipped = {"<=": ">=", "=<": ">=", "<": ">=", ">=": "<=", "=>": "<=", ">": "<=", "=": "="}
+    index = 0
+    while index < len(tokens):
+        kind, token = tokens[index]
+        if kind == "name" and token.lower() not in ["inf", "infinity"]:
+            column = token
+            index += 1
+            if index < len(tokens) and tokens[index] == ("name", "free"):
+                model.add_column(column)
+                model.lower[column] = None
+                model.upper[column] = None
+                index += 1
+                continue
+            if index >= len(tokens) or tokens[index][0] != "operator":
+                raise model.error(f"The bound of {column} needs a comparison operator.")
+            comparison_operator = tokens[index][1]
+            value, index = lp_value(model, tokens, index + 1)
+            lp_apply_bound(model, column, comparison_operator, value)
+            continue
+        value, index = lp_value(model, tokens, index)
+        if index + 1 >= len(tokens) or tokens[index][0] != "operator":
+            raise model.error("A bound needs a comparison operator.")
+        comparison_operator, column = tokens[index][1], tokens[index + 1][1]
+        lp_apply_bound(model, column, flipped[comparison_operator], value)
+        index += 2
+        if index < len(tokens) and tokens[index][0] == "operator":
+            comparison_operator = tokens[index][1]
+            value, index = lp_value(model, tokens, index + 1)
+            lp_apply_bound(model, column, comparison_operator, value)
@@ -0,0 +1,122 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import csv
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+from spreadsheet_solver.solver import Solver
+
+try:
+    import fcntl
+except ImportError:  # not available on windows, appends are not locked there
+    fcntl = None
+
+
+class ResultStore:
+    """Append-only table of solver results (json lines), shared by all runs and processes.
+
+    Records are buffered and appended by a single write per flush while holding an
+    exclusive lock, hence concurrent processes never interleave partial records.
+    The per-label csv files of the report are export views of this table.
+    """
+
+    def __init__(
+        self, path: str = "datasets/results/results.jsonl", buffer_size: int = 64
+    ) -> None:
+        """Construct result store."""
+        self.path: str = path
+        self.buffer_size: int = buffer_size
+        self.buffer: List[dict] = []
+
+    def __enter__(self) -> "ResultStore":
+        """Use result store as context, buffered records are flushed on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Flush buffered records."""
+        self.flush()
+
+    def append(self, record: dict) -> None:
+        """Buffer a record, see Solver.result_record, flushed once the buffer is full."""
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append all buffered records by a single locked write."""
+        if not self.buffer:
+            return
+        data = "".join(json.dumps(record) + "\n" for record in self.buffer).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+            written = 0
+            while written < len(data):
+                written += os.write(descriptor, data[written:])
+            os.fsync(descriptor)
+        finally:
+            # closing the descriptor releases the lock
+            os.close(descriptor)
+        self.buffer = []
+
+    def records(self, label: Optional[str] = None) -> Iterator[dict]:
+        """Stream stored records (of a label) in order of appending."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as file:
+            for line in file:
+                # a crashed writer can leave a truncated last line
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if label is None or record["label"] == label:
+                    yield record
+
+    def latest(self) -> Dict[str, dict]:
+        """Most recent record per label."""
+        latest: Dict[str, dict] = {}
+        for record in self.records():
+            latest[record["label"]] = record
+        return latest
+
+    def export_csv(self, label: str, directory: str = "datasets/replication") -> bool:
+        """Write the most recent solution of a label as {label}.csv (report layout).
+
+        Returns False if the label has no stored solution.
+        """
+        record = None
+        for candidate in self.records(label):
+            record = candidate
+        return ResultStore.write_view(record, directory)
+
+    def export_all(self, directory: str = "datasets/replication") -> int:
+        """Write the report view of every label, returns the number of written files."""
+        return sum(
+            ResultStore.write_view(record, directory) for record in self.latest().values()
+        )
+
+    @staticmethod
+    def write_view(record: Optional[dict], directory: str) -> bool:
+        """Write the report view of a record, skipped for records without solution."""
+        if record is None or record["optimum"] is None:
+            return False
+        row = Solver.table_row(
+            record["label"], record["values"].keys(), record["values"].values(), record["optimum"]
+        )
+        filename = os.path.join(directory, f"{record['label']}.csv")
+        with open(filename, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(row.keys()))
+            writer.writeheader()
+            writer.writerow(row)
+        print(f"Results have been successfully stored in {filename}.")
+        return True
@@ -0,0 +1,251 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from spreadsheet_solver import InvalidConfig
+from spreadsheet_solver.cache import SolutionCache
+from spreadsheet_solver.config import Config
+from spreadsheet_solver.presolve import Infeasible, presolve, reduce_columns
+from spreadsheet_solver.solver import Solver, Timeout
+
+# cancellation flags shared with the worker processes, i.e. upper bound for requests in flight
+MAX_IN_FLIGHT: int = 4096
+
+# cancellation flags of the current worker process, set by the pool initializer
+_cancel_flags = None
+
+
+def init_worker(flags) -> None:
+    """Pool initializer, attach cancellation flags to worker process."""
+    global _cancel_flags
+    _cancel_flags = flags
+
+
+def is_scalar(value) -> bool:
+    """Whether a json value is a string, number, boolean or null, i.e. usable as request id."""
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def check_request(request) -> None:
+    """Raise ValueError unless a request is a json object with scalar ids and valid timeout."""
+    if not isinstance(request, dict):
+        raise ValueError("A request needs to be a json object.")
+    if not is_scalar(request.get("id")) or not is_scalar(request.get("cancel")):
+        raise ValueError("The id of a request needs to be a string, number, boolean or null.")
+    timeout = request.get("timeout")
+    if timeout is not None and (
+        isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout >= 0
+    ):
+        raise ValueError("The timeout of a request needs to be a non-negative number.")
+
+
+def solve_request(request: dict, slot: int, deadline: float, use_cache: bool) -> dict:
+    """Solve a request in a worker process, returns its response (without id).
+
+    The request holds a config mapping ("config") or the path of a config/model file
+    ("path"). The solver timeout is the time left until the wall clock deadline of the
+    request (at most the config timeout), a set cancellation flag aborts the search.
+    """
+    start = time.perf_counter()
+    # label of the result record, default: file name (like main.py) or request id
+    if "label" in request:
+        label = str(request["label"])
+    elif "path" in request:
+        label = os.path.basename(str(request["path"])).split(".")[0]
+    else:
+        label = str(request.get("id"))
+    response = {"label": label, "optimum": None, "values": {}}
+    # solver output would interleave with the responses of the service
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            if "path" in request:
+                config = Config(request["path"])
+            else:
+                config = Config.from_data(request.get("config"), f"of request {label}")
+            if config.get_sweep() is not None:
+                raise InvalidConfig("Sweeps are not supported by the solve service.")
+            timeout = min(deadline - time.time(), config.get_timeout())
+            if timeout <= 0:
+                return {**response, "status": "timeout", "seconds": 0.0}
+            criterion = config.get_criterion()
+            decision_variables = config.get_decision_variables(apply_constraints=True)
+            constraint_variables = config.get_constraint_variables()
+            reduction = None
+            if config.get_presolve():
+                presolve(decision_variables, constraint_variables)
+                reduction = reduce_columns(criterion, decision_variables, constraint_variables)
+            solver = Solver(
+                timeout=timeout,
+                criterion=criterion,
+                decision_variables=decision_variables
+                if reduction is None
+                else reduction.reduced_decision_variables,
+                constraint_variables=constraint_variables
+                if reduction is None
+                else reduction.reduced_constraint_variables,
+                engine=config.get_engine(),
+                # concurrency is provided by the worker pool of the service
+                workers=1,
+            )
+            if use_cache:
+                solver.cache = SolutionCache()
+            solver.cancelled = lambda: _cancel_flags[slot] == 1
+            solver.solve()
+            if reduction is not None:
+                solver = reduction.postsolve(solver)
+        except InvalidConfig as e:
+            return {**response, "status": "error", "error": e.message}
+        except Infeasible:
+            return {**response, "status": "infeasible", "seconds": time.perf_counter() - start}
+        except Timeout:
+            status = "cancelled" if _cancel_flags[slot] == 1 else "timeout"
+            return {**response, "status": status, "seconds": time.perf_counter() - start}
+    record = solver.result_record(label, time.perf_counter() - start)
+    if not solver.proven and _cancel_flags[slot] == 1:
+        record["status"] = "cancelled"
+    return record
+
+
+class SolveService:
+    """Persistent pool of solver processes, serving json line requests of streams.
+
+    Requests: {"id": ..., "config": {...}} or {"id": ..., "path": ...}, optionally with a
+    "timeout" in seconds (deadline of the request, measured from its receipt) and a
+    "label". {"cancel": id} cancels a request of the same stream. Every request is
+    answered by one json line holding its id, status (proven, timeout, infeasible,
+    cancelled or error), optimum, values, engine and solve time, in order of completion.
+    """
+
+    def __init__(self, workers: int, use_cache: bool = True) -> None:
+        """Construct service, the worker processes are started right away."""
+        self.use_cache: bool = use_cache
+        self.flags = multiprocessing.Array("b", MAX_IN_FLIGHT, lock=False)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(self.flags,)
+        )
+        self.lock = threading.Lock()
+        self.free_slots: List[int] = list(range(MAX_IN_FLIGHT))
+        # start workers before the first request arrives
+        for future in [self.executor.submit(int) for _ in range(workers)]:
+            future.result()
+
+    def close(self) -> None:
+        """Stop the worker processes once all requests are answered."""
+        self.executor.shutdown(wait=True)
+
+    def serve_stream(self, lines: Iterable[str], write: Callable[[str], None]) -> None:
+        """Serve the requests of a stream, returns once all of them are answered."""
+        # requests in flight of this stream by id: future and cancellation slot
+        in_flight: Dict[object, Tuple[Future, int]] = {}
+        done = threading.Condition(self.lock)
+
+        def respond(response: dict) -> None:
+            write(json.dumps(response) + "\n")
+
+        def finish(request_id, slot: int, future: Future) -> None:
+            if future.cancelled():
+                response = {"status": "cancelled"}
+            elif future.exception() is not None:
+                response = {"status": "error", "error": str(future.exception())}
+            else:
+                response = future.result()
+            with self.lock:
+                respond({"id": request_id, **response})
+                del in_flight[request_id]
+                self.flags[slot] = 0
+                self.free_slots.append(slot)
+                done.notify_all()
+
+        for line in lines:
+            if not line.strip():
+                continue
+            request = None
+            try:
+                request = json.loads(line)
+                check_request(request)
+            except ValueError as e:
+                # answer with the id of the request if it is usable
+                request_id = request.get("id") if isinstance(request, dict) else None
+                with self.lock:
+                    respond(
+                        {
+                            "id": request_id if is_scalar(request_id) else None,
+                            "status": "error",
+                            "error": str(e),
+                        }
+                    )
+                continue
+            if "cancel" in request:
+                with self.lock:
+                    entry = in_flight.get(request["cancel"])
+                    if entry is not None:
+                        self.flags[entry[1]] = 1
+                if entry is not None:
+                    # requests that did not start yet are answered by finish()
+                    entry[0].cancel()
+                continue
+            request_id = request.get("id")
+            timeout = request.get("timeout")
+            deadline = time.time() + timeout if timeout is not None else math.inf
+            with self.lock:
+                if request_id in in_flight or not self.free_slots:
+                    respond(
+                        {
+                            "id": request_id,
+                            "status": "error",
+                            "error": "The request id is in use or too many requests are in flight.",
+                        }
+                    )
+                    continue
+                slot = self.free_slots.pop()
+                future = self.executor.submit(
+                    solve_request, request, slot, deadline, self.use_cache
+                )
+                in_flight[request_id] = (future, slot)
+            future.add_done_callback(
+                lambda future, request_id=request_id, slot=slot: finish(
+                    request_id, slot, future
+                )
+            )
+        with self.lock:
+            done.wait_for(lambda: not in_flight)
+
+    def serve_socket(self, path: str) -> None:
+        """Serve connections of a unix domain socket, one request stream per connection."""
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                """Serve the request stream of a connection."""
+                lines = (line.decode("utf-8") for line in self.rfile)
+
+                def write(text: str) -> None:
+                    self.wfile.write(text.encode("utf-8"))
+                    self.wfile.flush()
+
+                service.serve_stream(lines, write)
+
+        if os.path.exists(path):
+            os.remove(path)
+        with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+            print(f"Solve service is listening on {path}.", flush=True)
+            try:
+                server.serve_forever()
+            finally:
+                os.remove(path)
@@ -7,11 +7,21 @@ without any warranty. \
 SPDX-License-Identifier: FSFAP
 """
 import csv
-import signal
-from typing import List
+import heapq
+import math
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
 
-from spreadsheet_solver import InvalidConfig
-from spreadsheet_solver.data_types import DecisionVariable
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only required by the vectorized engine
+    np = None
+
+from spreadsheet_solver import InvalidConfig, lp
+from spreadsheet_solver.data_types import EPSILON, DecisionVariable
+from spreadsheet_solver.knapsack import MAX_CELLS, KnapsackForm, knapsack_form, knapsack_search
+from spreadsheet_solver.mitm import MAX_HALF, MeetInTheMiddle, half_sizes, mitm_form, mitm_search
+from spreadsheet_solver.model import CompiledModel
 
 
 class Timeout(Exception):
@@ -31,11 +41,23 @@ class Solver:
         """Allowed criteria of solver."""
         return ["max", "min"]
 
+    # call Solver.allowed_engines()
+    @staticmethod
+    def allowed_engines() -> List[str]:
+        """Allowed search engines of solver."""
+        return ["brute_force", "bnb", "vectorized", "lp", "knapsack", "mitm", "auto"]
+
+    # call Solver.chunk_size()
+    @staticmethod
+    def chunk_size() -> int:
+        """Number of candidate points evaluated at once by the vectorized engine."""
+        return 1 << 16
+
     # call Solver.epsilon_comp_val()
     @staticmethod
     def epsilon_comp_val() -> float:
         """Epsilon value for float comparison (provide delta)."""
-        return 1e-7
+        return EPSILON
 
     @staticmethod
     def check_paper_scenario(label: str) -> str:
@@ -55,9 +77,49 @@ class Solver:
         criterion: str,
         decision_variables: dict,
         constraint_variables: dict,
+        engine: str = "brute_force",
+        workers: int = 1,
     ):
-        """Constructor for spreadsheet solver."""
+        """Constructor for spreadsheet solver.
+
+        Engine knapsack solves single row integer models by dynamic programming, engine
+        mitm models with one or two rows by meet-in-the-middle enumeration, both fall back
+        to brute_force otherwise. auto selects the engine by model structure.
+        """
         self.timeout = timeout
+        if engine not in Solver.allowed_engines():
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to initialize the solver. "
+                    f'The engine "{engine}" is not allowed. '
+                    f"Only the following engines are allowed: "
+                    f"{Solver.allowed_engines()}."
+                )
+            )
+        if engine == "vectorized" and np is None:
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to initialize the solver. "
+                    f'The engine "{engine}" requires the python package numpy.'
+                )
+            )
+        self.engine = engine
+        if not isinstance(workers, int) or workers < 1:
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to initialize the solver. "
+                    f"The number of workers needs to be a positive integer."
+                )
+            )
+        self.workers: int = workers
+        # best objective (w.r.t. maximization) of concurrently searching workers
+        self.shared_incumbent = None
+        # optional memoization of proven solutions, see spreadsheet_solver.cache
+        self.cache = None
+        # optional instrumentation, see spreadsheet_solver.stats
+        self.stats = None
+        # optional cancellation check, aborts the search like a timeout once it returns True
+        self.cancelled: Optional[Callable[[], bool]] = None
         if criterion not in Solver.allowed_criteria():
             raise InvalidConfig(
                 (
@@ -91,84 +153,548 @@ class Solver:
             self.decision_variables.append(decision_variable)
         self.number_decision_variables: int = len(decision_variables)
         self.constraint_variables = constraint_variables
+        # index-based form of the problem, consumed by all engines
+        self.model: CompiledModel = CompiledModel.compile(
+            criterion=criterion,
+            decision_variables=self.decision_variables,
+            constraint_variables=constraint_variables,
+            epsilon=Solver.epsilon_comp_val(),
+        )
+        if self.model.is_mixed() and engine not in ["bnb", "lp", "auto"]:
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to initialize the solver. "
+                    f'The engine "{engine}" enumerates integer values only, continuous '
+                    f'decision variables require the engine "bnb" or "lp".'
+                )
+            )
+        if engine == "lp" and self.model.integer_columns:
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to initialize the solver. "
+                    f'The engine "lp" requires all decision variables to be continuous, '
+                    f'models with integer decision variables require the engine "bnb".'
+                )
+            )
+        # engine of the last solve, resolved from auto (or knapsack fallback) or decomposition
+        self.selected_engine: str = engine
         self.optimum = None
         self.optimal_decision_variable_values = []
+        # anytime state: deadline of the running solve, number of resolved points
+        self.deadline: Optional[float] = None
+        self.proven: bool = True
+        self.explored: int = 0
+
+    @classmethod
+    def from_model(
+        cls, model: CompiledModel, timeout: int, engine: str, workers: int = 1
+    ) -> "Solver":
+        """Construct solver of a compiled model, e.g. for sub-problems."""
+        decision_variables, constraint_variables = model.to_variables()
+        return cls(
+            timeout=timeout,
+            criterion=model.criterion,
+            decision_variables=decision_variables,
+            constraint_variables=constraint_variables,
+            engine=engine,
+            workers=workers,
+        )
+
+    def current_decision_variable_values(self) -> List[int]:
+        """Current (inplace) count values of decision variables."""
+        return [decision_variable.value for decision_variable in self.decision_variables]
 
     def any_violated_constraints(self) -> bool:
         """Check if current (inplace) count values of decision variables violate any constraints."""
-        if self.constraint_variables is None:
-            return False
-        for (
-            constraint_variable_name,
-            constraint_variable,
-        ) in self.constraint_variables.items():
-            _sum = 0
-            for dv_name, dv_cost in constraint_variable.dependencies:
-                dv_value = self.decision_variables_name_map[dv_name].value
-                _sum += dv_value * dv_cost
-
-            sum_left: float = _sum
-            sum_right: float = constraint_variable.constraint_value
-
-            if constraint_variable.comparison_operator == "<=":
-                if sum_left > (sum_right + Solver.epsilon_comp_val()):
-                    return True
-            if constraint_variable.comparison_operator == "<":
-                if sum_left >= sum_right:
-                    return True
-            if constraint_variable.comparison_operator == ">=":
-                if sum_left < (sum_right - Solver.epsilon_comp_val()):
-                    return True
-            if constraint_variable.comparison_operator == ">":
-                if sum_left <= sum_right:
-                    return True
-        # no violation, return True
-        return False
+        return not self.model.is_feasible(self.current_decision_variable_values())
 
     def objective_function(self) -> float:
         """Criterion for optimization problem."""
-        result = 0
-        for decision_variable in self.decision_variables:
-            result += decision_variable.unit_profit * decision_variable.value
-        return result
+        return self.model.objective_value(self.current_decision_variable_values())
 
-    def brute_force(self, index=0) -> None:
+    def brute_force(self) -> None:
         """Naive brute-force algorithm to solve linear programming problem."""
         # solver method
         # lin prog optimization
-        # generate nested for loop over all decision variables
-        # adjust decision variable values inplace, save optimal values
-        if self.number_decision_variables <= 0:
+        # depth-first enumeration, one level per decision variable, last level are leaves
+        # running partial sums of objective and constraint variables are kept per level,
+        # hence a leaf only adds the contribution of the last decision variable
+        # values are visited best objective contribution first, such that a strong
+        # incumbent is found early, and subtrees are cut by interval bounds, i.e. the
+        # best objective and least constraint usage the unassigned variables can reach
+        # ties are broken like in plain counting order, results are identical
+        model = self.model
+        number_dvs = model.number_variables
+        if number_dvs <= 0:
             return
-        for dv_value in range(
-            self.decision_variables[index].lower_bound,
-            self.decision_variables[index].upper_bound + 1,
-        ):
-            self.decision_variables[
-                index
-            ].value = dv_value  # update decision value inplace - efficient solution!
-            if index + 1 < self.number_decision_variables:
-                self.brute_force(index + 1)
+        lower_bounds = model.lower_bounds
+        upper_bounds = model.upper_bounds
+        unit_profits = model.unit_profits
+        number_rows = model.number_rows
+        maximize: bool = model.criterion == "max"
+        sense = 1.0 if maximize else -1.0
+        # split constraints into rows touched by the last decision variable and the rest
+        last = number_dvs - 1
+        leaf_costs = dict(model.columns[last])
+        leaf_rows = []
+        prefix_rows = []
+        for row in range(number_rows):
+            bound = (row, model.signs[row], model.limits[row], model.strict[row])
+            if row in leaf_costs:
+                leaf_rows.append(bound + (leaf_costs[row], len(leaf_rows)))
+            else:
+                prefix_rows.append(bound)
+        # (row, cost) pairs of every prefix level
+        columns = model.columns
+
+        # value order per level: descending if a larger value improves the objective
+        orders = []
+        for index in range(number_dvs):
+            if sense * unit_profits[index] > 0:
+                orders.append(range(upper_bounds[index], lower_bounds[index] - 1, -1))
             else:
-                # given all decision variable values, calculate total profit and check for optimal solution
-                result = self.objective_function()
-                # check for constraint violations, if any then continue
-                if self.any_violated_constraints():
+                orders.append(range(lower_bounds[index], upper_bounds[index] + 1))
+        # interval bounds of the unassigned decision variables index.. per level
+        # best reachable objective (w.r.t. maximization) and least usage per row
+        objective_reach = [0.0] * (number_dvs + 1)
+        row_reach = [[0.0] * number_rows for _ in range(number_dvs + 1)]
+        subtree_sizes = [1] * (number_dvs + 1)
+        for index in range(last, -1, -1):
+            lower_bound, upper_bound = lower_bounds[index], upper_bounds[index]
+            profit = sense * unit_profits[index]
+            objective_reach[index] = objective_reach[index + 1] + max(
+                profit * lower_bound, profit * upper_bound
+            )
+            row_reach[index][:] = row_reach[index + 1]
+            for row, dv_cost in columns[index]:
+                cost = model.signs[row] * dv_cost
+                row_reach[index][row] += min(cost * lower_bound, cost * upper_bound)
+            subtree_sizes[index] = subtree_sizes[index + 1] * len(orders[index])
+        # rounding margins, bounds never cut a subtree because of float error
+        objective_scale = 1.0
+        row_scales = [abs(limit) + 1.0 for limit in model.limits]
+        for index in range(number_dvs):
+            magnitude = max(abs(lower_bounds[index]), abs(upper_bounds[index]))
+            objective_scale += abs(unit_profits[index]) * magnitude
+            for row, dv_cost in columns[index]:
+                row_scales[row] += abs(dv_cost) * magnitude
+        objective_margin = 1e-9 * objective_scale
+        row_margins = [1e-9 * row_scale for row_scale in row_scales]
+        # integral profits: objective sums are exact, bounds may also cut ties
+        exact = objective_scale < 2**53 and all(
+            float(unit_profit).is_integer() for unit_profit in unit_profits
+        )
+
+        def is_cut(level: int) -> bool:
+            """Check if the subtree below a fixed prefix of the given length can be cut."""
+            constraint_sum = constraint_sums[level]
+            for row in range(number_rows):
+                reach = model.signs[row] * constraint_sum[row] + row_reach[level][row]
+                if reach > model.limits[row] + row_margins[row]:
+                    return True
+            bound = sense * objective_sums[level] + objective_reach[level]
+            if self.shared_incumbent is not None:
+                if bound < self.shared_incumbent.get() - objective_margin:
+                    return True
+            if self.optimum is None:
+                return False
+            optimum = sense * self.optimum
+            if not exact:
+                return bound < optimum - objective_margin
+            # subtree can at most tie, but only with solutions counting order finds later
+            return bound < optimum or (
+                bound == optimum
+                and dv_values[:level] > self.optimal_decision_variable_values[:level]
+            )
+
+        # partial sums over all decision variables before the given level
+        dv_values = list(lower_bounds)
+        objective_sums = [0.0] * number_dvs
+        constraint_sums = [[0.0] * number_rows for _ in range(number_dvs)]
+        # position within the value order per level
+        positions = [0] * number_dvs
+
+        # cheap counters, only published if statistics are collected
+        # leaves rejected per leaf row, constraint evaluations follow from these
+        rejected = [0] * len(leaf_rows)
+        leaves_visited = 0
+        points_pruned = 0
+        prefix_evaluations = 0
+        # search steps since the last deadline check, cut subtrees and prefixes violating
+        # their rows never reach a leaf block
+        nodes = 0
+        chunk_size = Solver.chunk_size()
+        level = 0
+        try:
+            while level >= 0:
+                nodes += 1
+                if nodes >= chunk_size:
+                    nodes = 0
+                    self.check_deadline()
+                if level < last:
+                    if positions[level] == len(orders[level]):
+                        # all values of this level done, backtrack
+                        level -= 1
+                        continue
+                    dv_value = orders[level][positions[level]]
+                    positions[level] += 1
+                    dv_values[level] = dv_value
+                    objective_sums[level + 1] = (
+                        objective_sums[level] + unit_profits[level] * dv_value
+                    )
+                    constraint_sums[level + 1][:] = constraint_sums[level]
+                    for row, dv_cost in columns[level]:
+                        constraint_sums[level + 1][row] += dv_value * dv_cost
+                    if is_cut(level + 1):
+                        points_pruned += subtree_sizes[level + 1]
+                        self.explored += subtree_sizes[level + 1]
+                    else:
+                        level += 1
+                        positions[level] = 0
                     continue
-                # pot. store optimal decision variable values, given criterion
-                if not self.optimum is None:
-                    if self.criterion == "max":
-                        if result <= self.optimum:
+
+                # leaves of the current prefix, afterwards backtrack
+                level -= 1
+                objective_sum = objective_sums[last]
+                constraint_sum = constraint_sums[last]
+                order = orders[last]
+                # constraints independent of the last decision variable hold for all leaves
+                violated = False
+                for row, sign, limit, strict in prefix_rows:
+                    prefix_evaluations += 1
+                    sum_left = sign * constraint_sum[row]
+                    if sum_left > limit or (strict and sum_left == limit):
+                        violated = True
+                        break
+                if violated:
+                    points_pruned += len(order)
+                    self.explored += len(order)
+                    continue
+                unit_profit = unit_profits[last]
+                shared = None
+                if self.shared_incumbent is not None:
+                    shared = self.shared_incumbent.get() - objective_margin
+                optimum = self.optimum
+                # leaves are visited in blocks, the deadline is checked once per block
+                for block_start in range(0, len(order), Solver.chunk_size()):
+                    self.check_deadline()
+                    block_end = min(block_start + Solver.chunk_size(), len(order))
+                    self.explored += block_end - block_start
+                    leaves_visited += block_end - block_start
+                    for dv_value in order[block_start:block_end]:
+                        # given all decision variable values, calculate total profit
+                        result = objective_sum + unit_profit * dv_value
+                        # leaves are ordered by profit, hence all further leaves are worse
+                        if (
+                            optimum is not None
+                            and (result < optimum if maximize else result > optimum)
+                        ) or (shared is not None and sense * result < shared):
+                            # remaining leaves are resolved without visiting them
+                            remaining = len(order) - abs(dv_value - order[0])
+                            self.explored += len(order) - block_end
+                            leaves_visited -= remaining - (len(order) - block_end)
+                            points_pruned += remaining
+                            break
+                        # check for constraint violations, if any then continue
+                        for row, sign, limit, strict, dv_cost, position in leaf_rows:
+                            sum_left = sign * (constraint_sum[row] + dv_value * dv_cost)
+                            if sum_left > limit or (strict and sum_left == limit):
+                                violated = True
+                                break
+                        if violated:
+                            violated = False
+                            rejected[position] += 1
                             continue
-                    if self.criterion == "min":
-                        if result >= self.optimum:
+                        dv_values[last] = dv_value
+                        # tie: keep the solution counting order would have found first
+                        if result == optimum and not self.is_better_solution(
+                            result, dv_values
+                        ):
                             continue
-                # optimal decision variable values (at this iteration state) -> update optimum and dv_values
-                optimal_dv_values = []
-                for index in range(self.number_decision_variables):
-                    optimal_dv_values.append(self.decision_variables[index].value)
-                self.optimum = result
-                self.optimal_decision_variable_values = optimal_dv_values
+                        self.store_optimum(result, dv_values)
+                        optimum = result
+                    else:
+                        continue
+                    break
+        finally:
+            if self.stats is not None:
+                # a feasible leaf evaluates all leaf rows, a rejected one up to its violation
+                feasible_points = leaves_visited - sum(rejected)
+                self.stats.add(
+                    leaves_visited=leaves_visited,
+                    points_pruned=points_pruned,
+                    feasible_points=feasible_points,
+                    constraint_evaluations=prefix_evaluations
+                    + feasible_points * len(leaf_rows)
+                    + sum(count * (position + 1) for position, count in enumerate(rejected)),
+                )
+
+    def is_better_solution(self, result: float, dv_values: List[int]) -> bool:
+        """Check if a feasible solution improves the optimum, given criterion."""
+        if self.optimum is None:
+            return True
+        if result != self.optimum:
+            if self.criterion == "max":
+                return result > self.optimum
+            return result < self.optimum
+        # tie: keep the solution brute-force would have found first
+        return dv_values < self.optimal_decision_variable_values
+
+    def store_optimum(self, result: float, dv_values: List[int]) -> None:
+        """Store optimal decision variable values, pot. share objective with other workers."""
+        self.optimum = result
+        self.optimal_decision_variable_values = list(dv_values)
+        if self.stats is not None:
+            self.stats.add(incumbent_updates=1)
+        if self.shared_incumbent is not None:
+            self.shared_incumbent.offer(result if self.criterion == "max" else -result)
+
+    def evaluate_leaf(self, dv_values: List[int]) -> None:
+        """Evaluate a full assignment of decision variable values, pot. store optimum."""
+        model = self.model
+        for row in range(model.number_rows):
+            if model.is_violated(row, model.row_activity(row, dv_values)):
+                if self.stats is not None:
+                    self.stats.add(constraint_evaluations=row + 1)
+                return
+        if self.stats is not None:
+            self.stats.add(constraint_evaluations=model.number_rows, feasible_points=1)
+        result = model.objective_value(dv_values)
+        if self.is_better_solution(result, dv_values):
+            self.store_optimum(result, dv_values)
+
+    def subproblem(
+        self, rows: List[Tuple[List[float], float]], prefix: List[int]
+    ) -> Optional[Tuple[float, List[float]]]:
+        """Linear program with the first integer decision variables fixed to prefix values.
+
+        Returns the optimal value w.r.t. maximization (i.e. negated for criterion min) and
+        values of all decision variables, None if infeasible.
+        """
+        model = self.model
+        if self.stats is not None:
+            self.stats.add(relaxations=1)
+        sense = 1.0 if model.criterion == "max" else -1.0
+        fixed = dict(zip(model.integer_columns, prefix))
+        free = [column for column in range(model.number_variables) if column not in fixed]
+        objective = [sense * unit_profit for unit_profit in model.unit_profits]
+        fixed_value = sum(objective[column] * dv_value for column, dv_value in fixed.items())
+        free_rows = []
+        for coefficients, rhs in rows:
+            fixed_usage = sum(
+                coefficients[column] * dv_value for column, dv_value in fixed.items()
+            )
+            free_rows.append(([coefficients[column] for column in free], rhs - fixed_usage))
+        solution = lp.maximize(
+            [objective[column] for column in free],
+            free_rows,
+            [float(model.lower_bounds[column]) for column in free],
+            [float(model.upper_bounds[column]) for column in free],
+        )
+        if solution is None:
+            return None
+        dv_values = [0.0] * model.number_variables
+        for column, dv_value in fixed.items():
+            dv_values[column] = dv_value
+        for column, dv_value in zip(free, solution[1]):
+            dv_values[column] = dv_value
+        return fixed_value + solution[0], dv_values
+
+    def relaxation_bound(
+        self, rows: List[Tuple[List[float], float]], prefix: List[int]
+    ) -> Optional[float]:
+        """LP-relaxation bound of the subtree with fixed prefix values, None if infeasible.
+
+        The bound is returned w.r.t. maximization, i.e. negated for criterion min. A
+        relaxation that did not converge bounds nothing (infinite bound).
+        """
+        try:
+            solution = self.subproblem(rows, prefix)
+        except lp.NotConverged:
+            return math.inf
+        if solution is None:
+            return None
+        return solution[0]
+
+    def is_pruned(self, bound: float, prefix: List[int]) -> bool:
+        """Check if a subtree (bound w.r.t. maximization) can not improve the optimum."""
+        epsilon: float = Solver.epsilon_comp_val()
+        # another worker already found a strictly better solution
+        if self.shared_incumbent is not None and bound < self.shared_incumbent.get() - epsilon:
+            return True
+        if self.optimum is None:
+            return False
+        optimum = self.optimum if self.criterion == "max" else -self.optimum
+        if bound < optimum - epsilon:
+            return True
+        if self.model.is_mixed():
+            # ties of mixed models are not broken in brute-force order
+            return bound <= optimum + epsilon
+        # subtree can at most tie, but only with solutions brute-force would have found later
+        return (
+            bound <= optimum + epsilon
+            and prefix > self.optimal_decision_variable_values[: len(prefix)]
+        )
+
+    def branch_and_bound(self) -> None:
+        """Branch-and-bound algorithm to solve linear programming problem."""
+        # depth-first search, one tree level per integer decision variable
+        # children are ordered by their LP-relaxation bound (best first)
+        # subtrees that can not beat the incumbent optimum are cut
+        # continuous decision variables are left to the linear programs
+        if self.model.number_variables <= 0:
+            return
+        rows = self.model.relaxation_rows()
+        if self.relaxation_bound(rows, []) is None:
+            self.explored = self.model.search_space_size()
+            if self.stats is not None:
+                self.stats.add(points_pruned=self.explored)
+            return
+        if not self.model.integer_columns:
+            self.linear_program()
+            return
+        self.branch([], rows, self.model.lp_rows())
+
+    def branch(
+        self,
+        prefix: List[int],
+        rows: List[Tuple[List[float], float]],
+        lp_rows: List[Tuple[List[float], float]],
+    ) -> None:
+        """Expand branch-and-bound node given fixed prefix values.
+
+        Bounds are computed on the relaxation rows, continuous decision variables of
+        leaves are solved on the (epsilon tightened) lp rows.
+        """
+        self.check_deadline()
+        if self.stats is not None:
+            self.stats.add(nodes=1)
+        model = self.model
+        index = len(prefix)
+        column = model.integer_columns[index]
+        dv_range = range(model.lower_bounds[column], model.upper_bounds[column] + 1)
+        if index + 1 == len(model.integer_columns):
+            for dv_value in dv_range:
+                if model.is_mixed():
+                    self.evaluate_subproblem(prefix + [dv_value], lp_rows)
+                else:
+                    self.evaluate_leaf(prefix + [dv_value])
+            self.explored += len(dv_range)
+            if self.stats is not None:
+                self.stats.add(leaves_visited=len(dv_range))
+            return
+        # number of points per child subtree
+        subtree_size = 1
+        for child_column in model.integer_columns[index + 1 :]:
+            subtree_size *= model.upper_bounds[child_column] - model.lower_bounds[child_column] + 1
+        children = []
+        for dv_value in dv_range:
+            child = prefix + [dv_value]
+            bound = self.relaxation_bound(rows, child)
+            if bound is None or self.is_pruned(bound, child):
+                self.explored += subtree_size
+                if self.stats is not None:
+                    self.stats.add(points_pruned=subtree_size)
+                continue
+            children.append((-bound, dv_value))
+        children.sort()
+        for negative_bound, dv_value in children:
+            child = prefix + [dv_value]
+            # incumbent may have improved since the child has been bounded
+            if self.is_pruned(-negative_bound, child):
+                self.explored += subtree_size
+                if self.stats is not None:
+                    self.stats.add(points_pruned=subtree_size)
+                continue
+            self.branch(child, rows, lp_rows)
+
+    def evaluate_subproblem(
+        self, prefix: List[int], lp_rows: List[Tuple[List[float], float]]
+    ) -> None:
+        """Solve the continuous decision variables given all integer values, pot. store optimum."""
+        try:
+            solution = self.subproblem(lp_rows, prefix)
+        except lp.NotConverged:
+            # the leaf is not evaluated, hence the optimum is not proven
+            self.proven = False
+            return
+        if solution is None:
+            return
+        self.evaluate_leaf(solution[1])
+
+    def linear_program(self) -> None:
+        """Bounded-variable simplex for problems of continuous decision variables only."""
+        if self.model.number_variables <= 0:
+            return
+        self.explored = self.model.search_space_size()
+        self.evaluate_subproblem([], self.model.lp_rows())
+
+    def vectorized_search(self) -> None:
+        """Vectorized brute-force algorithm, evaluates chunks of candidate points at once."""
+        # candidate points are enumerated in brute-force order via their flat index
+        # sums are accumulated column by column in the same order as objective_function()
+        # and any_violated_constraints(), hence results are bitwise identical
+        model = self.model
+        if model.number_variables <= 0:
+            return
+        lower_bounds = np.array(model.lower_bounds, dtype=np.int64)
+        widths = [
+            upper_bound - lower_bound + 1
+            for lower_bound, upper_bound in zip(model.lower_bounds, model.upper_bounds)
+        ]
+        total = model.search_space_size()
+        if total <= 0:
+            return
+        if total >= 1 << 62:
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to initialize the vectorized engine. "
+                    f"The search space of {total} points is too large to be enumerated."
+                )
+            )
+        # strides of the mixed radix flat index, last decision variable changes fastest
+        strides = [1] * model.number_variables
+        for index in range(model.number_variables - 2, -1, -1):
+            strides[index] = strides[index + 1] * widths[index + 1]
+        rows = [model.row(row) for row in range(model.number_rows)]
+
+        for start in range(0, total, Solver.chunk_size()):
+            self.check_deadline()
+            flat = np.arange(start, min(start + Solver.chunk_size(), total), dtype=np.int64)
+            self.explored += len(flat)
+            points = (flat[:, None] // strides) % widths + lower_bounds
+            result = np.zeros(len(flat))
+            for index, unit_profit in enumerate(model.unit_profits):
+                result += unit_profit * points[:, index]
+            feasible = np.ones(len(flat), dtype=bool)
+            for row, dependencies in enumerate(rows):
+                sum_left = np.zeros(len(flat))
+                for column, dv_cost in dependencies:
+                    sum_left += points[:, column] * dv_cost
+                sum_left *= model.signs[row]
+                if model.strict[row]:
+                    feasible &= sum_left < model.limits[row]
+                else:
+                    feasible &= sum_left <= model.limits[row]
+            if self.stats is not None:
+                # all rows are evaluated for every point of a chunk
+                self.stats.add(
+                    leaves_visited=len(flat),
+                    constraint_evaluations=len(flat) * len(rows),
+                    feasible_points=int(np.count_nonzero(feasible)),
+                )
+            if not feasible.any():
+                continue
+            # reduce chunk to its best feasible point, first occurrence wins ties
+            candidates = np.where(feasible, result, np.nan)
+            if model.criterion == "max":
+                best = int(np.nanargmax(candidates))
+            else:
+                best = int(np.nanargmin(candidates))
+            best_result = float(result[best])
+            best_values = [int(dv_value) for dv_value in points[best]]
+            if self.is_better_solution(best_result, best_values):
+                self.store_optimum(best_result, best_values)
 
     def set_optimal_decision_variable_values(self) -> None:
         """Setter for final decision variable counts once optimum has been determined."""
@@ -186,6 +712,13 @@ class Solver:
             return
         # print objective
         print(f"Objective: {self.optimum}")
+        if not self.proven:
+            fraction, gap = self.progress()
+            gap_repr = f"{gap:.2%}" if gap is not None else "unknown"
+            print(
+                f"Objective is not proven optimal: timed out after {self.timeout} seconds, "
+                f"explored {fraction:.2%} of the search space, gap to bound {gap_repr}."
+            )
         # print constraint variables
         if self.constraint_variables:
             for (
@@ -202,47 +735,279 @@ class Solver:
             print(decision_variable)
         print("")
 
-    def save_results_as_csv(self, label: str) -> None:
-        """Save spreadsheet solver (optimal) solution as csv."""
-        if self.optimum is None:
-            return
-        results = [{"Scenario": Solver.check_paper_scenario(label)}]
-        fieldnames = ["Scenario"]
-        for decision_variable in self.decision_variables:
-            key: str = decision_variable.name.capitalize() + " Count"
-            fieldnames.append(key)
-            results[0][key] = decision_variable.value
+    def result_row(self, label: str) -> dict:
+        """Spreadsheet solver (optimal) solution as table row, keys in column order."""
+        return self.solution_row(
+            label,
+            self.optimum,
+            [decision_variable.value for decision_variable in self.decision_variables],
+        )
+
+    def solution_row(self, label: str, result: float, dv_values: Iterable) -> dict:
+        """Any solution as table row, keys in column order."""
+        return Solver.table_row(
+            label,
+            [decision_variable.name for decision_variable in self.decision_variables],
+            dv_values,
+            result,
+        )
+
+    @staticmethod
+    def table_row(label: str, dv_names: Iterable[str], dv_values: Iterable, result: float) -> dict:
+        """Solution as table row of the report, keys in column order."""
+        row = {"Scenario": Solver.check_paper_scenario(label)}
+        for dv_name, dv_value in zip(dv_names, dv_values):
+            key: str = dv_name.capitalize() + " Count"
+            row[key] = dv_value
 
         # float -> int type conversion for cleaner tables
         epsilon: float = Solver.epsilon_comp_val()
-        optimum = self.optimum
-        if abs(optimum - round(optimum)) <= epsilon:
-            optimum = int(round(optimum, 1))
+        if abs(result - round(result)) <= epsilon:
+            result = int(round(result, 1))
 
-        fieldnames.append("Total Profit")
-        results[0]["Total Profit"] = optimum
+        row["Total Profit"] = result
+        return row
 
-        filename = f"datasets/replication/{label}.csv"
-        # Write data to CSV file
+    def result_record(
+        self, label: str, seconds: float, parameters: Optional[dict] = None
+    ) -> dict:
+        """Solution as record of the result store, see spreadsheet_solver.results."""
+        if self.optimum is not None:
+            status = "proven" if self.proven else "timeout"
+        else:
+            status = "infeasible" if self.proven else "timeout"
+        return {
+            "label": label,
+            "parameters": parameters or {},
+            "values": {
+                decision_variable.name: decision_variable.value
+                for decision_variable in self.decision_variables
+            }
+            if self.optimum is not None
+            else {},
+            "optimum": self.optimum,
+            "engine": self.selected_engine,
+            "workers": self.workers,
+            "seconds": seconds,
+            "status": status,
+        }
+
+    def save_results_as_csv(self, label: str) -> None:
+        """Save spreadsheet solver (optimal) solution as csv."""
+        from spreadsheet_solver.results import ResultStore
+
+        ResultStore.write_view(self.result_record(label, 0.0), "datasets/replication")
+
+    def save_solutions_as_csv(
+        self, label: str, solutions: Iterable[Tuple[float, Tuple[int, ...]]], suffix: str
+    ) -> int:
+        """Save a stream of solutions as csv, rows are written as they arrive.
+
+        Returns the number of stored solutions.
+        """
+        filename = f"datasets/replication/{label}_{suffix}.csv"
+        fieldnames = list(self.solution_row(label, 0.0, [None] * self.number_decision_variables))
+        count = 0
         with open(filename, mode="w", newline="") as file:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
-            for row in results:
-                writer.writerow(row)
-        print(f"Results have been successfully stored in {filename}.")
+            for result, dv_values in solutions:
+                writer.writerow(self.solution_row(label, result, dv_values))
+                count += 1
+        print(f"{count} solutions have been successfully stored in {filename}.")
+        return count
+
+    def iter_feasible(self) -> Iterator[Tuple[float, Tuple[int, ...]]]:
+        """Lazily enumerate all feasible points in counting order as (objective, values).
 
-    def timeout_handler(self, signum, frame):
-        """timeout handler."""
-        raise TimeoutError(f"Solver function timed out after {self.timeout} seconds.")
+        Honors the deadline of a running solve (Timeout is raised in between blocks).
+        """
+        model = self.model
+        if model.is_mixed():
+            raise InvalidConfig(
+                (
+                    f"An error occurred while trying to enumerate the feasible points. "
+                    f"Continuous decision variables have infinitely many values."
+                )
+            )
+        number_dvs = model.number_variables
+        if number_dvs <= 0 or model.search_space_size() <= 0:
+            return
+        last = number_dvs - 1
+        lower_bounds = model.lower_bounds
+        upper_bounds = model.upper_bounds
+        unit_profits = model.unit_profits
+        leaf_costs = dict(model.columns[last])
+        leaf_rows = []
+        prefix_rows = []
+        for row in range(model.number_rows):
+            bound = (row, model.signs[row], model.limits[row], model.strict[row])
+            if row in leaf_costs:
+                leaf_rows.append(bound + (leaf_costs[row],))
+            else:
+                prefix_rows.append(bound)
+        # odometer with running partial sums per level, see brute_force()
+        dv_values = list(lower_bounds)
+        objective_sums = [0.0] * number_dvs
+        constraint_sums = [[0.0] * model.number_rows for _ in range(number_dvs)]
+        level = 0
+        while True:
+            for index in range(level, last):
+                objective_sums[index + 1] = (
+                    objective_sums[index] + unit_profits[index] * dv_values[index]
+                )
+                constraint_sums[index + 1][:] = constraint_sums[index]
+                for row, dv_cost in model.columns[index]:
+                    constraint_sums[index + 1][row] += dv_values[index] * dv_cost
+            objective_sum = objective_sums[last]
+            constraint_sum = constraint_sums[last]
+            if not any(
+                sign * constraint_sum[row] > limit
+                or (strict and sign * constraint_sum[row] == limit)
+                for row, sign, limit, strict in prefix_rows
+            ):
+                prefix = tuple(dv_values[:last])
+                for block_start in range(
+                    lower_bounds[last], upper_bounds[last] + 1, Solver.chunk_size()
+                ):
+                    self.check_deadline()
+                    block_end = min(block_start + Solver.chunk_size(), upper_bounds[last] + 1)
+                    for dv_value in range(block_start, block_end):
+                        for row, sign, limit, strict, dv_cost in leaf_rows:
+                            sum_left = sign * (constraint_sum[row] + dv_value * dv_cost)
+                            if sum_left > limit or (strict and sum_left == limit):
+                                break
+                        else:
+                            yield objective_sum + unit_profits[last] * dv_value, prefix + (
+                                dv_value,
+                            )
+            # advance odometer to the next prefix of decision variable values
+            level = last - 1
+            while level >= 0 and dv_values[level] == upper_bounds[level]:
+                level -= 1
+            if level < 0:
+                return
+            dv_values[level] += 1
+            for index in range(level + 1, last):
+                dv_values[index] = lower_bounds[index]
+
+    def top_k(self, k: int) -> List[Tuple[float, Tuple[int, ...]]]:
+        """K best feasible points (best first), kept in a bounded heap of size k.
+
+        Ties are ordered like the optimum, i.e. counting order. On timeout the best
+        points found so far are returned and the solver is marked as not proven.
+        """
+        if k <= 0:
+            return []
+        sense = 1.0 if self.criterion == "max" else -1.0
+        # min-heap, its root is the worst kept point: lower objective or later in order
+        heap: List[Tuple[float, int, float, Tuple[int, ...]]] = []
+        self.deadline = time.monotonic() + self.timeout
+        self.proven = True
+        try:
+            for order, (result, dv_values) in enumerate(self.iter_feasible()):
+                key = (sense * result, -order, result, dv_values)
+                if len(heap) < k:
+                    heapq.heappush(heap, key)
+                elif key > heap[0]:
+                    heapq.heapreplace(heap, key)
+        except Timeout:
+            self.proven = False
+        finally:
+            self.deadline = None
+        return [(result, dv_values) for _, _, result, dv_values in sorted(heap, reverse=True)]
+
+    def check_deadline(self) -> None:
+        """Cooperative timeout, called by the engines in between units of work."""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise Timeout(f"Solver function timed out after {self.timeout} seconds.")
+        if self.cancelled is not None and self.cancelled():
+            raise Timeout("Solver function has been cancelled.")
+
+    def progress(self) -> Tuple[float, Optional[float]]:
+        """Fraction of the search space explored and relative gap of optimum to the LP bound."""
+        total = self.model.search_space_size()
+        fraction = min(self.explored / total, 1.0) if total > 0 else 1.0
+        if self.optimum is None or self.model.number_variables <= 0:
+            return fraction, None
+        bound = self.relaxation_bound(self.model.relaxation_rows(), [])
+        if bound is None or math.isinf(bound):
+            return fraction, None
+        optimum = self.optimum if self.criterion == "max" else -self.optimum
+        return fraction, max(bound - optimum, 0.0) / max(abs(optimum), 1.0)
+
+    def select_engine(self) -> Tuple[str, Union[KnapsackForm, MeetInTheMiddle, None]]:
+        """Resolve engines knapsack, mitm and auto, with the form of the selected engine."""
+        if self.engine not in ["knapsack", "mitm", "auto"]:
+            return self.engine, None
+        if self.engine == "auto" and not self.model.integer_columns:
+            return "lp", None
+        if self.engine == "auto" and self.model.is_mixed():
+            return "bnb", None
+        size = self.model.search_space_size()
+        form = knapsack_form(self.model) if self.engine != "mitm" else None
+        if (
+            form is not None
+            and form.cells() <= MAX_CELLS
+            and (self.engine == "knapsack" or form.cells() < size)
+        ):
+            return "knapsack", form
+        split = mitm_form(self.model) if self.engine != "knapsack" else None
+        if split is not None:
+            first, second = half_sizes(self.model, split.split)
+            # sorting the halves costs a logarithmic factor over their enumeration
+            if max(first, second) <= MAX_HALF and (
+                self.engine == "mitm" or 16 * (first + second) < size
+            ):
+                return "mitm", split
+        return "brute_force", None
 
     def solve(self) -> None:
         """Solver entry-point."""
-        signal.signal(signal.SIGALRM, self.timeout_handler)
-        signal.alarm(self.timeout)
-        try:
-            self.brute_force()
+        # anytime solving: on timeout the best solution found so far is kept (not proven)
+        self.deadline = time.monotonic() + self.timeout
+        self.proven = True
+        self.explored = 0
+        if self.cache is not None and self.cache.lookup(self):
+            self.selected_engine = "cache"
+            if self.stats is not None:
+                self.stats.add(cache_hits=1)
+            self.deadline = None
             self.set_optimal_decision_variable_values()
+            return
+        from spreadsheet_solver.decompose import independent_blocks
+
+        # independent blocks are solved on their own, their search spaces add up
+        blocks = independent_blocks(self.model) if self.engine != "lp" else None
+        engine, form = ("decomposition", blocks) if blocks is not None else self.select_engine()
+        self.selected_engine = engine
+        try:
+            if engine == "decomposition":
+                from spreadsheet_solver.decompose import decomposed_search
+
+                decomposed_search(self, blocks)
+            elif engine == "knapsack":
+                knapsack_search(self, form)
+            elif engine == "mitm":
+                mitm_search(self, form)
+            elif self.workers > 1 and self.model.integer_columns:
+                from spreadsheet_solver.parallel import parallel_search
+
+                parallel_search(self)
+            elif engine == "bnb":
+                self.branch_and_bound()
+            elif engine == "vectorized":
+                self.vectorized_search()
+            elif engine == "lp":
+                self.linear_program()
+            else:
+                self.brute_force()
         except Timeout as e:
-            raise Timeout(e.message)
+            self.proven = False
+            if self.optimum is None:
+                raise Timeout(e.message)
         finally:
-            signal.alarm(0)
+            self.deadline = None
+        self.set_optimal_decision_variable_values()
+        if self.cache is not None:
+            self.cache.store(self)
@@ -0,0 +1,66 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import contextlib
+import json
+import time
+from typing import Dict, Iterator
+
+
+class SolverStatistics:
+    """Counters and phase timings of a solve, collected only if attached to the solver."""
+
+    # call SolverStatistics.counter_names()
+    @staticmethod
+    def counter_names() -> list:
+        """Names of the collected counters."""
+        return [
+            "leaves_visited",
+            "points_pruned",
+            "constraint_evaluations",
+            "feasible_points",
+            "incumbent_updates",
+            "nodes",
+            "relaxations",
+            "cache_hits",
+        ]
+
+    def __init__(self) -> None:
+        """Construct statistics, all counters and timings zero."""
+        self.counters: Dict[str, int] = {name: 0 for name in SolverStatistics.counter_names()}
+        # seconds per phase, e.g. parse, build, presolve, search
+        self.timings: Dict[str, float] = {}
+
+    def add(self, **counters: int) -> None:
+        """Add to counters."""
+        for name, value in counters.items():
+            self.counters[name] += value
+
+    def merge(self, other: dict) -> None:
+        """Add counters of another statistics dict, e.g. of a worker process."""
+        for name, value in other.get("counters", {}).items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure wall clock time of a phase (accumulated if entered repeatedly)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict:
+        """Statistics as json serializable dict."""
+        return {"counters": dict(self.counters), "timings": dict(self.timings)}
+
+    def save_as_json(self, filename: str) -> None:
+        """Save statistics as json."""
+        with open(filename, mode="w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+        print(f"Statistics have been successfully stored in {filename}.")
@@ -0,0 +1,84 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+from typing import Iterator, List, Tuple
+
+from spreadsheet_solver import InvalidConfig
+from spreadsheet_solver.presolve import Infeasible, presolve
+from spreadsheet_solver.solver import Solver, Timeout
+
+
+def rhs_sweep(
+    solver: Solver,
+    constraint_variable_name: str,
+    constraint_values: List[float],
+    apply_presolve: bool = True,
+) -> Iterator[Tuple[float, Solver]]:
+    """Solve the solver model for a series of right-hand sides of one constraint variable.
+
+    Every step is warm started by the previous step: if the previous optimum remains
+    feasible it either seeds the incumbent (feasible set grew) or is returned right
+    away (feasible set shrank, hence it stays optimal). Yields the right-hand side and
+    the solved solver per step, steps without solution have no optimum.
+    """
+    model = solver.model
+    if constraint_variable_name not in model.row_names:
+        raise InvalidConfig(
+            (
+                f"An error occurred while trying to parse the sweep. "
+                f"The constraint variable {constraint_variable_name} needs to be created first."
+            )
+        )
+    row = model.row_names.index(constraint_variable_name)
+    previous = None
+    for constraint_value in constraint_values:
+        step_model = model.with_constraint_value(row, constraint_value)
+        decision_variables, constraint_variables = step_model.to_variables()
+        infeasible = False
+        if apply_presolve:
+            try:
+                presolve(decision_variables, constraint_variables)
+            except Infeasible:
+                infeasible = True
+        step = Solver(
+            timeout=solver.timeout,
+            criterion=solver.criterion,
+            decision_variables=decision_variables,
+            constraint_variables=constraint_variables,
+            engine=solver.engine,
+            workers=solver.workers,
+        )
+        step.cache = solver.cache
+        # statistics accumulate over all steps
+        step.stats = solver.stats
+        if infeasible:
+            yield constraint_value, step
+            continue
+        if previous is not None and previous.optimum is not None:
+            dv_values = previous.optimal_decision_variable_values
+            if step.model.is_feasible(dv_values) and all(
+                lower_bound <= dv_value <= upper_bound
+                for dv_value, lower_bound, upper_bound in zip(
+                    dv_values, step.model.lower_bounds, step.model.upper_bounds
+                )
+            ):
+                if step.model.limits[row] <= previous.model.limits[row] and previous.proven:
+                    # feasible set shrank, previous optimum remains optimal
+                    step.store_optimum(previous.optimum, dv_values)
+                    step.set_optimal_decision_variable_values()
+                    previous = step
+                    yield constraint_value, step
+                    continue
+                # feasible set grew, previous optimum is a feasible incumbent
+                step.store_optimum(previous.optimum, dv_values)
+        try:
+            step.solve()
+        except Timeout:
+            step.proven = False
+        previous = step
+        yield constraint_value, step
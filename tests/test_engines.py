@@ -0,0 +1,146 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import glob
+from typing import List, Optional, Tuple
+
+import pytest
+
+from spreadsheet_solver.config import Config
+from spreadsheet_solver.data_types import ConstraintVariable, DecisionVariable
+from spreadsheet_solver.solver import Solver, np
+
+# integer engines, every one of them has to report the same optimum and tie-broken point
+ENGINES: List[str] = [
+    engine
+    for engine in ["brute_force", "bnb", "vectorized", "knapsack", "mitm", "auto"]
+    if engine != "vectorized" or np is not None
+]
+
+
+def build(
+    criterion: str,
+    bounds: List[Tuple[str, float, int, int]],
+    rows: List[Tuple[str, List[Tuple[str, float]], str, float]],
+) -> Tuple[str, dict, Optional[dict]]:
+    """Model of (name, unit profit, lower, upper) decision variables and constraint rows."""
+    decision_variables = {}
+    for name, unit_profit, lower_bound, upper_bound in bounds:
+        decision_variable = DecisionVariable(name, unit_profit)
+        decision_variable.apply_constraint(">=", lower_bound)
+        decision_variable.apply_constraint("<=", upper_bound)
+        decision_variables[name] = decision_variable
+    constraint_variables = {
+        name: ConstraintVariable(name, dependencies, comparison_operator, value)
+        for name, dependencies, comparison_operator, value in rows
+    }
+    return criterion, decision_variables, constraint_variables or None
+
+
+# name: (model, expected optimum, expected decision variable values)
+MODELS = {
+    # all points on the row tie, counting order finds x=0, y=3 first
+    "tie": (
+        lambda: build(
+            "max", [("x", 1, 0, 3), ("y", 1, 0, 3)], [("c", [("x", 1), ("y", 1)], "<=", 3)]
+        ),
+        3.0,
+        [0, 3],
+    ),
+    "negative_costs_min": (
+        lambda: build(
+            "min",
+            [("a", 3, -2, 5), ("b", -2, 0, 6), ("c", 1, 1, 4)],
+            [("r", [("a", -2), ("b", 3), ("c", 1)], ">", 4)],
+        ),
+        -17.0,
+        [-2, 6, 1],
+    ),
+    "strict_single_row": (
+        lambda: build(
+            "max",
+            [("p", 4, 0, 9), ("q", 6, 0, 7), ("s", 2, 2, 5)],
+            [("w", [("p", 3), ("q", 5), ("s", 1)], "<", 31)],
+        ),
+        42.0,
+        [5, 2, 5],
+    ),
+    # two rows, the halves of meet-in-the-middle keep Pareto-efficient points only
+    "two_rows": (
+        lambda: build(
+            "max",
+            [("a", 5, 0, 4), ("b", 3, 0, 6), ("c", -2, -3, 3), ("d", 4, 0, 5), ("e", 1, 0, 7)],
+            [
+                ("weight", [("a", 3), ("b", 2), ("c", -1), ("d", 4), ("e", 1)], "<=", 20),
+                ("volume", [("a", 1), ("b", 3), ("c", 2), ("d", -2), ("e", 2)], "<=", 12),
+            ],
+        ),
+        33.0,
+        [3, 4, -3, 0, 0],
+    ),
+    # three independent blocks with tied optima each, solved separately
+    "independent_blocks": (
+        lambda: build(
+            "max",
+            [("x", 1, 0, 3), ("y", 1, 0, 3), ("u", 1, 0, 4), ("v", 2, 0, 4), ("z", 1, 0, 2)],
+            [
+                ("first", [("x", 1), ("y", 1)], "<=", 3),
+                ("second", [("u", 1), ("v", 2)], "<=", 4),
+            ],
+        ),
+        9.0,
+        [0, 3, 0, 2, 2],
+    ),
+}
+
+
+def solve(model, engine: str, workers: int = 1) -> Tuple[Optional[float], list]:
+    """Optimum and optimal decision variable values of a model solved by an engine."""
+    criterion, decision_variables, constraint_variables = model()
+    solver = Solver(
+        timeout=60,
+        criterion=criterion,
+        decision_variables=decision_variables,
+        constraint_variables=constraint_variables,
+        engine=engine,
+        workers=workers,
+    )
+    solver.solve()
+    assert solver.proven
+    return solver.optimum, solver.optimal_decision_variable_values
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_engines_agree(name: str, engine: str) -> None:
+    model, optimum, dv_values = MODELS[name]
+    assert solve(model, engine) == (optimum, dv_values)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_parallel_engines_agree(name: str, engine: str) -> None:
+    model, optimum, dv_values = MODELS[name]
+    assert solve(model, engine, workers=2) == (optimum, dv_values)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "path", sorted(glob.glob("configs/head_first_data_analysis_chap3/*.yaml"))
+)
+def test_paper_scenarios(path: str, engine: str) -> None:
+    config = Config(path)
+
+    def model():
+        return (
+            config.get_criterion(),
+            config.get_decision_variables(apply_constraints=True),
+            config.get_constraint_variables(),
+        )
+
+    assert solve(model, engine) == solve(model, "brute_force")
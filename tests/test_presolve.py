@@ -0,0 +1,69 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import pytest
+
+from spreadsheet_solver.presolve import presolve, reduce_columns
+from spreadsheet_solver.solver import Solver
+from tests.test_engines import build
+
+# models presolve reduces, by fixed decision variables and/or merged identical columns
+MODELS = {
+    "identical_columns": lambda: build(
+        "max",
+        [("a", 3, 0, 3), ("b", 3, 0, 3), ("c", 3, 0, 3), ("d", 1, 0, 4)],
+        [("r", [("a", 2), ("b", 2), ("c", 2), ("d", 1)], "<=", 7)],
+    ),
+    "dominated_columns": lambda: build(
+        "max",
+        [("x", 2, 0, 5), ("y", -1, 1, 4), ("z", 0, 0, 3), ("w", 4, 0, 6)],
+        [
+            ("r", [("y", 2), ("z", 1), ("w", 3)], "<=", 14),
+            ("s", [("z", -1), ("w", 1)], ">=", 1),
+        ],
+    ),
+    "identical_columns_min": lambda: build(
+        "min",
+        [("p", 2, 1, 4), ("q", -3, 0, 2), ("u", -3, 0, 2), ("v", 5, 0, 3)],
+        [("r", [("p", 1), ("q", 2), ("u", 2), ("v", -1)], "<", 9)],
+    ),
+}
+
+
+def solve(criterion: str, decision_variables: dict, constraint_variables) -> Solver:
+    """Brute-force solver of a model, after solve()."""
+    solver = Solver(
+        timeout=60,
+        criterion=criterion,
+        decision_variables=decision_variables,
+        constraint_variables=constraint_variables,
+        engine="brute_force",
+    )
+    solver.solve()
+    return solver
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_postsolve_round_trip(name: str) -> None:
+    expected = solve(*MODELS[name]())
+    criterion, decision_variables, constraint_variables = MODELS[name]()
+    presolve(decision_variables, constraint_variables)
+    reduction = reduce_columns(criterion, decision_variables, constraint_variables)
+    assert reduction is not None
+    assert reduction.fixed or reduction.groups
+    solver = reduction.postsolve(
+        solve(
+            criterion,
+            reduction.reduced_decision_variables,
+            reduction.reduced_constraint_variables,
+        )
+    )
+    assert solver.proven
+    assert solver.model.names == expected.model.names
+    assert solver.optimum == expected.optimum
+    assert solver.optimal_decision_variable_values == expected.optimal_decision_variable_values
@@ -0,0 +1,77 @@
+"""License notice
+Copyright 2024, Andreas Einwiller <einwil01@ads.uni-passau.de> \
+Copying and distribution of this file, with or without modification,
+are permitted in any medium without royalty provided the copyright
+notice and this notice are preserved.  This file is offered as-is,
+without any warranty. \
+SPDX-License-Identifier: FSFAP
+"""
+import json
+from typing import Dict, List
+
+import pytest
+
+from spreadsheet_solver.service import SolveService
+
+# max x + y, all points on the row tie, brute-force finds x=0, y=3 first
+TIE_CONFIG: dict = {
+    "timeout": 10,
+    "criterion": "max",
+    "decision_variables": [["x", 1], ["y", 1]],
+    "decision_variable_constraints": [
+        ["x", ">=", 0],
+        ["x", "<=", 3],
+        ["y", ">=", 0],
+        ["y", "<=", 3],
+    ],
+    "constraint_variables": [["c", [["x", 1], ["y", 1]], "<=", 3]],
+}
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = SolveService(workers=2, use_cache=False)
+    yield service
+    service.close()
+
+
+def serve(service: SolveService, requests: List[object]) -> Dict[object, dict]:
+    """Responses by id of a stream of requests (json values or raw lines)."""
+    lines = [request if isinstance(request, str) else json.dumps(request) for request in requests]
+    output: List[str] = []
+    service.serve_stream(lines, output.append)
+    responses = [json.loads(line) for line in output]
+    assert len(responses) == len(lines)
+    return {response["id"]: response for response in responses}
+
+
+def test_solve_requests(service: SolveService) -> None:
+    responses = serve(
+        service,
+        [
+            {"id": 1, "config": TIE_CONFIG},
+            {"id": "paper", "path": "configs/head_first_data_analysis_chap3/scenario2.yaml"},
+        ],
+    )
+    assert responses[1]["status"] == "proven"
+    assert responses[1]["optimum"] == 3.0
+    assert responses[1]["values"] == {"x": 0, "y": 3}
+    assert responses["paper"]["status"] == "proven"
+    assert responses["paper"]["label"] == "scenario2"
+    assert responses["paper"]["optimum"] == 2320.0
+
+
+def test_invalid_requests(service: SolveService) -> None:
+    responses = serve(
+        service,
+        [
+            "not json",
+            {"id": 2, "timeout": -1, "config": TIE_CONFIG},
+            {"id": 3, "config": {"criterion": "max"}},
+            {"id": 4, "timeout": 0, "config": TIE_CONFIG},
+        ],
+    )
+    assert responses[None]["status"] == "error"
+    assert responses[2]["status"] == "error"
+    assert responses[3]["status"] == "error"
+    assert responses[4]["status"] == "timeout"